@@ -1,37 +1,90 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import os
-import shutil
-import re
+import time
 from pathlib import Path
-from collections import defaultdict
+from collections import deque
 import threading
 import base64
+import logging
+import multiprocessing
+import queue
 from io import BytesIO
+from logging.handlers import RotatingFileHandler
 
-try:
-    import pdfplumber
-    from pypdf import PdfReader, PdfWriter
-except ImportError:
-    pdfplumber = None
-    PdfReader = None
-    PdfWriter = None
+from engine import (
+    EXCEL_ENGINES,
+    OUTPUT_MODES,
+    FolderWatcher,
+    ProcessingError,
+    app_data_dir,
+    clear_table_cache,
+    default_worker_count,
+    describe_progress,
+    describe_stages,
+    is_installed,
+    iter_pdf_records,
+    open_extraction_cache,
+    open_layout_profiles,
+    rename_pdfs,
+    split_excel,
+    split_patterns,
+    split_pdf,
+)
 
-try:
-    from PIL import Image, ImageTk
-except ImportError:
-    Image = None
-    ImageTk = None
+# Worker threads never touch Tk directly; their log lines and row updates are
+# queued and applied by the main loop in batches at this interval.
+UI_DRAIN_INTERVAL_MS = 50
+UI_DRAIN_MAX_EVENTS = 5000
+LOG_LEVELS = ("info", "success", "warning", "error")
+LOG_MAX_LINES = 5000
+LOG_FILE_BYTES = 5 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+SCAN_CHUNK_ROWS = 500
+# Checked with find_spec at start-up; the libraries themselves are imported
+# by the engine when a workflow first needs them.
+DEPENDENCIES = ("pdfplumber", "pypdf", "pandas", "openpyxl")
 
-try:
-    import pandas as pd
-except ImportError:
-    pd = None
 
-try:
-    import openpyxl
-except ImportError:
-    openpyxl = None
+def open_activity_log():
+    """Logger that keeps the full activity log in rotating files under app_data_dir()/logs."""
+    logger = logging.getLogger("slcm_processor.activity")
+    if not logger.handlers:
+        folder = os.path.join(app_data_dir(), "logs")
+        os.makedirs(folder, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(folder, "activity.log"),
+            maxBytes=LOG_FILE_BYTES,
+            backupCount=LOG_FILE_BACKUPS,
+            encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(tag)-7s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class LogHistory:
+    """The most recent activity-log messages as (text, level) pairs.
+
+    Lets the log widget be rebuilt after a mode switch without keeping a
+    whole run in memory; the full log goes to the rotating file instead.
+    """
+    
+    def __init__(self, max_lines=LOG_MAX_LINES):
+        self.entries = deque(maxlen=max_lines)
+    
+    def extend(self, segments):
+        self.entries.extend(zip(segments[::2], segments[1::2]))
+    
+    def resize(self, max_lines):
+        if max_lines != self.entries.maxlen:
+            self.entries = deque(self.entries, maxlen=max_lines)
+    
+    def segments(self):
+        """Flattened text, tag, text, tag, ... arguments for ``Text.insert``."""
+        return [part for entry in self.entries for part in entry]
 
 
 class ModernPDFRenamer:
@@ -43,9 +96,25 @@ class ModernPDFRenamer:
         
         self.folder_path = tk.StringVar()
         self.file_path = tk.StringVar()
-        self.pdf_files = []
+        self.file_records = {}
+        self.scan_generation = 0
+        self.recursive_scan = tk.BooleanVar(value=False)
+        self.include_patterns = tk.StringVar(value="*.pdf")
+        self.exclude_patterns = tk.StringVar(value="")
         self.processing = False
+        self.watch_stop = None
         self.current_mode = "pdf_rename"
+        self.worker_count = tk.IntVar(value=default_worker_count())
+        self.sharded_split = tk.BooleanVar(value=False)
+        self.use_layouts = tk.BooleanVar(value=False)
+        self.use_cache = tk.BooleanVar(value=True)
+        self.resume_run = tk.BooleanVar(value=False)
+        self.output_mode = tk.StringVar(value="copy")
+        self.streaming_excel = tk.BooleanVar(value=False)
+        self.excel_engine = tk.StringVar(value="auto")
+        self.use_table_cache = tk.BooleanVar(value=True)
+        self.profile_run = tk.BooleanVar(value=False)
+        self.profile_cprofile = tk.BooleanVar(value=False)
         
         self.colors = {
             'primary': '#2c3e50',
@@ -59,10 +128,20 @@ class ModernPDFRenamer:
             'sidebar_active': '#2c3e50'
         }
         
-        self.set_app_icon()
+        self.ui_queue = queue.Queue()
+        self.log_max_lines = tk.IntVar(value=LOG_MAX_LINES)
+        self.log_filters = {level: tk.BooleanVar(value=True) for level in LOG_LEVELS}
+        self.log_history = LogHistory()
+        try:
+            self.activity_log = open_activity_log()
+        except Exception:
+            self.activity_log = None
         
         self.setup_ui()
+        # Decoding the icon needs PIL; do it once the window is up.
+        self.root.after_idle(self.set_app_icon)
         self.check_dependencies()
+        self.root.after(UI_DRAIN_INTERVAL_MS, self.drain_ui_queue)
         
     def set_app_icon(self):
         icon_data = """
@@ -81,11 +160,15 @@ class ModernPDFRenamer:
         """
         
         try:
-            if Image and ImageTk:
-                icon_bytes = base64.b64decode(icon_data.replace('\n', '').replace(' ', ''))
-                icon_image = Image.open(BytesIO(icon_bytes))
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                self.root.iconphoto(True, icon_photo)
+            from PIL import Image, ImageTk
+        except ImportError:
+            return
+        
+        try:
+            icon_bytes = base64.b64decode(icon_data.replace('\n', '').replace(' ', ''))
+            icon_image = Image.open(BytesIO(icon_bytes))
+            icon_photo = ImageTk.PhotoImage(icon_image)
+            self.root.iconphoto(True, icon_photo)
         except Exception:
             pass
         
@@ -302,6 +385,41 @@ class ModernPDFRenamer:
             state=tk.DISABLED
         )
         self.scan_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
+        self.create_scan_filters(folder_frame)
+    
+    def create_scan_filters(self, parent):
+        filter_frame = tk.Frame(parent, bg=self.colors['card'])
+        filter_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        tk.Checkbutton(
+            filter_frame,
+            text="Include subfolders",
+            variable=self.recursive_scan,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card']
+        ).pack(side=tk.LEFT)
+        
+        for label, variable in (("Include:", self.include_patterns), ("Exclude:", self.exclude_patterns)):
+            tk.Label(
+                filter_frame,
+                text=label,
+                font=("Segoe UI", 9),
+                bg=self.colors['card'],
+                fg=self.colors['primary']
+            ).pack(side=tk.LEFT, padx=(15, 5))
+            
+            tk.Entry(
+                filter_frame,
+                textvariable=variable,
+                width=18,
+                font=("Segoe UI", 9),
+                relief=tk.FLAT,
+                bg="#f8f9fa",
+                fg=self.colors['primary']
+            ).pack(side=tk.LEFT)
     
     def create_file_selection_section(self, parent):
         file_frame = tk.LabelFrame(
@@ -484,7 +602,9 @@ class ModernPDFRenamer:
         )
         self.count_label.pack(pady=(5, 0))
         
-        self.checkbox_states = {}
+        self.selected_items = set()
+        self.file_records = {}
+        self.scan_generation += 1
     
     def create_controls_section(self, parent):
         control_frame = tk.Frame(parent, bg=self.colors['bg'])
@@ -541,11 +661,202 @@ class ModernPDFRenamer:
         )
         self.refresh_btn.pack(fill=tk.X)
         
-        self.progress = ttk.Progressbar(btn_frame, mode='indeterminate')
-        self.progress.pack(fill=tk.X, pady=(15, 0))
+        self.watch_btn = tk.Button(
+            btn_frame,
+            text="Stop Watching" if self.watch_stop else "Watch Folder",
+            command=self.toggle_watch,
+            font=("Segoe UI", 9),
+            bg=self.colors['warning'],
+            fg="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            pady=8
+        )
+        self.watch_btn.pack(fill=tk.X, pady=(10, 0))
+        
+        self.clear_cache_btn = tk.Button(
+            btn_frame,
+            text="Clear Extraction Cache",
+            command=self.clear_extraction_cache,
+            font=("Segoe UI", 9),
+            bg="#95a5a6",
+            fg="white",
+            relief=tk.FLAT,
+            cursor="hand2",
+            pady=8
+        )
+        self.clear_cache_btn.pack(fill=tk.X, pady=(10, 0))
+        
+        self.create_workers_option(btn_frame)
+        self.create_layout_option(btn_frame)
+        
+        tk.Checkbutton(
+            btn_frame,
+            text="Reuse names cached from earlier runs",
+            variable=self.use_cache,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card'],
+            anchor=tk.W
+        ).pack(fill=tk.X, pady=(5, 0))
+        
+        tk.Checkbutton(
+            btn_frame,
+            text="Resume interrupted run (skip files already done)",
+            variable=self.resume_run,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card'],
+            anchor=tk.W
+        ).pack(fill=tk.X, pady=(5, 0))
+        
+        output_frame = tk.Frame(btn_frame, bg=self.colors['card'])
+        output_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        tk.Label(
+            output_frame,
+            text="Output:",
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary']
+        ).pack(side=tk.LEFT)
+        
+        ttk.Combobox(
+            output_frame,
+            textvariable=self.output_mode,
+            values=OUTPUT_MODES,
+            state="readonly",
+            width=12
+        ).pack(side=tk.LEFT, padx=(10, 0))
+        
+        self.create_profile_option(btn_frame)
+        self.create_progress_section(btn_frame)
         
         self.create_log_section(control_frame)
     
+    def create_progress_section(self, parent):
+        self.progress = ttk.Progressbar(parent, mode='indeterminate')
+        self.progress.pack(fill=tk.X, pady=(15, 0))
+        
+        self.progress_text = tk.StringVar(value="")
+        tk.Label(
+            parent,
+            textvariable=self.progress_text,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            justify=tk.LEFT,
+            anchor=tk.W,
+            wraplength=380
+        ).pack(fill=tk.X, pady=(5, 0))
+    
+    def create_workers_option(self, parent):
+        workers_frame = tk.Frame(parent, bg=self.colors['card'])
+        workers_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        tk.Label(
+            workers_frame,
+            text="Parallel workers:",
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary']
+        ).pack(side=tk.LEFT)
+        
+        tk.Spinbox(
+            workers_frame,
+            from_=1,
+            to=max(64, default_worker_count()),
+            textvariable=self.worker_count,
+            width=5,
+            font=("Segoe UI", 9),
+            relief=tk.FLAT,
+            bg="#f8f9fa"
+        ).pack(side=tk.LEFT, padx=(10, 0))
+    
+    def create_layout_option(self, parent):
+        tk.Checkbutton(
+            parent,
+            text="Use layout profiles (read only the consignee region)",
+            variable=self.use_layouts,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card'],
+            anchor=tk.W
+        ).pack(fill=tk.X, pady=(5, 0))
+    
+    def create_profile_option(self, parent):
+        profile_frame = tk.Frame(parent, bg=self.colors['card'])
+        profile_frame.pack(fill=tk.X, pady=(5, 0))
+        
+        tk.Checkbutton(
+            profile_frame,
+            text="Profile this run (timings CSV in output folder)",
+            variable=self.profile_run,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card'],
+            anchor=tk.W
+        ).pack(side=tk.LEFT)
+        
+        tk.Checkbutton(
+            profile_frame,
+            text="+ cProfile",
+            variable=self.profile_cprofile,
+            font=("Segoe UI", 9),
+            bg=self.colors['card'],
+            fg=self.colors['primary'],
+            activebackground=self.colors['card'],
+            anchor=tk.W
+        ).pack(side=tk.LEFT, padx=(10, 0))
+    
+    def get_profile_mode(self):
+        if not self.profile_run.get():
+            return None
+        return "cprofile" if self.profile_cprofile.get() else "timings"
+    
+    def open_extraction_cache(self):
+        return open_extraction_cache(self.log)
+    
+    def clear_extraction_cache(self):
+        if self.processing:
+            return
+        
+        if not messagebox.askyesno("Clear Cache", "Forget all consignee names cached from earlier runs?"):
+            return
+        
+        cache = self.open_extraction_cache()
+        if cache:
+            try:
+                cache.clear()
+                self.log("Extraction cache cleared", "success")
+            except Exception as e:
+                self.log(f"Could not clear extraction cache: {str(e)}", "error")
+            finally:
+                cache.close()
+    
+    def clear_table_cache(self):
+        if self.processing:
+            return
+        
+        if not messagebox.askyesno("Clear Cache", "Delete the workbook copies kept for faster re-runs?"):
+            return
+        
+        try:
+            removed = clear_table_cache()
+            self.log(f"Table cache cleared ({removed} file(s) removed)", "success")
+        except Exception as e:
+            self.log(f"Could not clear table cache: {str(e)}", "error")
+    
+    def get_worker_count(self):
+        try:
+            return max(1, int(self.worker_count.get()))
+        except (tk.TclError, ValueError):
+            return default_worker_count()
+    
     def create_simple_controls_section(self, parent):
         control_frame = tk.Frame(parent, bg=self.colors['bg'])
         control_frame.pack(fill=tk.BOTH, expand=True)
@@ -594,8 +905,78 @@ class ModernPDFRenamer:
         )
         self.open_output_btn.pack(fill=tk.X)
         
-        self.progress = ttk.Progressbar(btn_frame, mode='indeterminate')
-        self.progress.pack(fill=tk.X, pady=(15, 0))
+        if self.current_mode == "pdf_split":
+            self.create_workers_option(btn_frame)
+            self.create_layout_option(btn_frame)
+            
+            tk.Checkbutton(
+                btn_frame,
+                text="Sharded mode (split large PDFs across workers)",
+                variable=self.sharded_split,
+                font=("Segoe UI", 9),
+                bg=self.colors['card'],
+                fg=self.colors['primary'],
+                activebackground=self.colors['card'],
+                anchor=tk.W
+            ).pack(fill=tk.X, pady=(5, 0))
+        else:
+            tk.Checkbutton(
+                btn_frame,
+                text="Streaming mode (large files, low memory)",
+                variable=self.streaming_excel,
+                font=("Segoe UI", 9),
+                bg=self.colors['card'],
+                fg=self.colors['primary'],
+                activebackground=self.colors['card'],
+                anchor=tk.W
+            ).pack(fill=tk.X, pady=(10, 0))
+            
+            engine_frame = tk.Frame(btn_frame, bg=self.colors['card'])
+            engine_frame.pack(fill=tk.X, pady=(5, 0))
+            
+            tk.Label(
+                engine_frame,
+                text="Writer engine:",
+                font=("Segoe UI", 9),
+                bg=self.colors['card'],
+                fg=self.colors['primary']
+            ).pack(side=tk.LEFT)
+            
+            ttk.Combobox(
+                engine_frame,
+                textvariable=self.excel_engine,
+                values=EXCEL_ENGINES,
+                state="readonly",
+                width=12
+            ).pack(side=tk.LEFT, padx=(10, 0))
+            
+            self.create_workers_option(btn_frame)
+            
+            tk.Checkbutton(
+                btn_frame,
+                text="Keep a fast-loading copy of the workbook for re-runs",
+                variable=self.use_table_cache,
+                font=("Segoe UI", 9),
+                bg=self.colors['card'],
+                fg=self.colors['primary'],
+                activebackground=self.colors['card'],
+                anchor=tk.W
+            ).pack(fill=tk.X, pady=(5, 0))
+            
+            tk.Button(
+                btn_frame,
+                text="Clear Table Cache",
+                command=self.clear_table_cache,
+                font=("Segoe UI", 9),
+                bg="#95a5a6",
+                fg="white",
+                relief=tk.FLAT,
+                cursor="hand2",
+                pady=8
+            ).pack(fill=tk.X, pady=(10, 0))
+        
+        self.create_profile_option(btn_frame)
+        self.create_progress_section(btn_frame)
         
         self.create_log_section(control_frame)
     
@@ -630,22 +1011,164 @@ class ModernPDFRenamer:
         self.log_text.tag_config("success", foreground="#27ae60")
         self.log_text.tag_config("warning", foreground="#f39c12")
         self.log_text.tag_config("error", foreground="#e74c3c")
+        
+        self.create_log_filters(log_frame)
+        
+        segments = self.log_history.segments()
+        if segments:
+            self.log_text.insert(tk.END, *segments)
+            self.log_text.see(tk.END)
+        self.apply_log_filters()
     
-    def log(self, message, level="info"):
-        self.log_text.insert(tk.END, message + "\n", level)
+    def create_log_filters(self, log_frame):
+        filter_frame = tk.Frame(log_frame, bg=self.colors['card'])
+        filter_frame.pack(fill=tk.X, pady=(5, 0), before=self.log_text)
+        
+        for level in LOG_LEVELS:
+            tk.Checkbutton(
+                filter_frame,
+                text=level.capitalize(),
+                variable=self.log_filters[level],
+                command=self.apply_log_filters,
+                font=("Segoe UI", 8),
+                bg=self.colors['card'],
+                fg=self.colors['primary'],
+                activebackground=self.colors['card']
+            ).pack(side=tk.LEFT)
+        
+        tk.Spinbox(
+            filter_frame,
+            from_=100,
+            to=100000,
+            increment=1000,
+            textvariable=self.log_max_lines,
+            command=self.trim_log,
+            width=7,
+            font=("Segoe UI", 8),
+            relief=tk.FLAT,
+            bg="#f8f9fa"
+        ).pack(side=tk.RIGHT)
+        
+        tk.Label(
+            filter_frame,
+            text="Lines kept:",
+            font=("Segoe UI", 8),
+            bg=self.colors['card'],
+            fg=self.colors['primary']
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+    
+    def apply_log_filters(self):
+        # Hidden levels are elided in place, so toggling a filter touches
+        # one tag instead of re-inserting the history.
+        for level, shown in self.log_filters.items():
+            self.log_text.tag_config(level, elide=not shown.get())
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
+    
+    def get_log_max_lines(self):
+        try:
+            return max(100, int(self.log_max_lines.get()))
+        except (tk.TclError, ValueError):
+            return LOG_MAX_LINES
+    
+    def trim_log(self, force=True):
+        """Drop the oldest widget lines once the log is over its limit.
+        
+        During a run lines are removed only after the limit is exceeded by
+        a tenth, so trimming happens in occasional bulk deletes.
+        """
+        max_lines = self.get_log_max_lines()
+        self.log_history.resize(max_lines)
+        
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        excess = lines - max_lines
+        if excess > 0 and (force or excess > max_lines // 10):
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+    
+    def log(self, message, level="info"):
+        if self.activity_log:
+            text = message.strip("\n")
+            if text:
+                self.activity_log.info(text, extra={'tag': level})
+        self.ui_queue.put(("log", message + "\n", level))
+    
+    def set_item_status(self, item, status):
+        record = self.file_records.get(item)
+        if record is not None:
+            record.status = status
+        self.ui_queue.put(("status", item, status))
+    
+    def report_progress(self, snapshot):
+        """``on_progress`` callback for the engine; safe to call from any thread."""
+        self.ui_queue.put(("progress", snapshot))
+    
+    def show_progress(self, snapshot):
+        if str(self.progress.cget("mode")) != "determinate":
+            self.progress.stop()
+            self.progress.config(mode='determinate')
+        self.progress.config(maximum=max(snapshot['total'], 1), value=snapshot['done'])
+        
+        text = describe_progress(snapshot)
+        if snapshot['stages']:
+            text += "\n" + describe_stages(snapshot['stages'])
+        self.progress_text.set(text)
+    
+    def call_in_ui(self, func, *args, **kwargs):
+        """Run ``func`` on the Tk thread once everything queued before it is shown."""
+        self.ui_queue.put(("call", func, args, kwargs))
+    
+    def drain_ui_queue(self):
+        try:
+            self.flush_ui_queue()
+        finally:
+            self.root.after(UI_DRAIN_INTERVAL_MS, self.drain_ui_queue)
+    
+    def flush_ui_queue(self, max_events=UI_DRAIN_MAX_EVENTS):
+        # Log lines go in with one multi-segment insert and a single scroll;
+        # repeated updates of the same Treeview row, and progress snapshots,
+        # collapse to the last one.
+        log_segments = []
+        statuses = {}
+        progress = []
+        
+        def apply_pending():
+            if log_segments:
+                self.log_history.extend(log_segments)
+                self.log_text.insert(tk.END, *log_segments)
+                self.trim_log(force=False)
+                self.log_text.see(tk.END)
+                log_segments.clear()
+            for item, status in statuses.items():
+                try:
+                    self.file_tree.set(item, "status", status)
+                except tk.TclError:
+                    pass
+            statuses.clear()
+            if progress:
+                self.show_progress(progress[-1])
+                progress.clear()
+        
+        for _ in range(max_events):
+            try:
+                event = self.ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = event[0]
+            if kind == "log":
+                log_segments.extend(event[1:])
+            elif kind == "status":
+                statuses[event[1]] = event[2]
+            elif kind == "progress":
+                progress.append(event[1])
+            else:
+                apply_pending()
+                func, args, kwargs = event[1:]
+                func(*args, **kwargs)
+        
+        apply_pending()
     
     def check_dependencies(self):
-        missing = []
-        if pdfplumber is None:
-            missing.append("pdfplumber")
-        if PdfReader is None:
-            missing.append("pypdf")
-        if pd is None:
-            missing.append("pandas")
-        if openpyxl is None:
-            missing.append("openpyxl")
+        missing = [name for name in DEPENDENCIES if not is_installed(name)]
         
         if missing:
             self.log(f"Missing dependencies: {', '.join(missing)}", "warning")
@@ -678,28 +1201,101 @@ class ModernPDFRenamer:
             self.log(f"File selected: {os.path.basename(file)}", "info")
     
     def scan_folder(self):
+        if self.processing:
+            return
+        
         folder = self.folder_path.get()
         if not folder or not os.path.exists(folder):
             messagebox.showerror("Error", "Please select a valid folder")
             return
         
         self.file_tree.delete(*self.file_tree.get_children())
-        self.pdf_files = []
-        self.checkbox_states = {}
+        self.file_records = {}
+        self.selected_items = set()
+        self.scan_generation += 1
         
+        self.scan_btn.config(state=tk.DISABLED)
+        self.rename_btn.config(state=tk.DISABLED)
+        self.count_label.config(text="Scanning...")
         self.log("Scanning for PDF files...", "info")
         
-        for file in os.listdir(folder):
-            if file.lower().endswith('.pdf'):
-                file_path = os.path.join(folder, file)
-                self.pdf_files.append(file_path)
-                idx = len(self.pdf_files)
-                
-                item_id = self.file_tree.insert("", tk.END, values=("[ ]", file, "Ready"), text=str(idx))
-                self.checkbox_states[item_id] = False
-        
-        if self.pdf_files:
-            count = len(self.pdf_files)
+        include = split_patterns(self.include_patterns.get()) or ["*.pdf"]
+        exclude = split_patterns(self.exclude_patterns.get())
+        pending = queue.Queue()
+        
+        thread = threading.Thread(
+            target=self.scan_folder_worker,
+            args=(folder, self.recursive_scan.get(), include, exclude, pending)
+        )
+        thread.daemon = True
+        thread.start()
+        
+        self.root.after(UI_DRAIN_INTERVAL_MS, self.insert_scanned_rows, self.scan_generation, pending)
+    
+    def scan_folder_worker(self, folder, recursive, include, exclude, pending):
+        # Records are handed over in chunks, flushed early on slow shares so
+        # the count keeps moving; a final None or exception ends the scan.
+        chunk = []
+        flushed = time.perf_counter()
+        try:
+            records = iter_pdf_records(
+                folder, recursive, include, exclude,
+                skip_dirs=[os.path.join(folder, "output")]
+            )
+            for record in records:
+                chunk.append(record)
+                if len(chunk) >= SCAN_CHUNK_ROWS or time.perf_counter() - flushed > 0.2:
+                    pending.put(chunk)
+                    chunk = []
+                    flushed = time.perf_counter()
+        except Exception as e:
+            if chunk:
+                pending.put(chunk)
+            pending.put(e)
+            return
+        
+        if chunk:
+            pending.put(chunk)
+        pending.put(None)
+    
+    def insert_scanned_rows(self, generation, pending):
+        if generation != self.scan_generation:
+            return
+        
+        try:
+            chunk = pending.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_DRAIN_INTERVAL_MS, self.insert_scanned_rows, generation, pending)
+            return
+        
+        if not isinstance(chunk, list):
+            self.finish_scan(chunk)
+            return
+        
+        try:
+            for record in chunk:
+                idx = len(self.file_records) + 1
+                item_id = self.file_tree.insert("", tk.END, values=("[ ]", record.name, record.status), text=str(idx))
+                self.file_records[item_id] = record
+            self.update_selection_count()
+        except tk.TclError:
+            # The file list was destroyed by a mode switch mid-scan.
+            return
+        
+        # Yield to the event loop between chunks so the window stays responsive.
+        self.root.after(1, self.insert_scanned_rows, generation, pending)
+    
+    def finish_scan(self, error=None):
+        self.scan_btn.config(state=tk.NORMAL)
+        
+        if error is not None:
+            self.count_label.config(text="Scan failed")
+            self.log(f"Error scanning folder: {str(error)}", "error")
+            messagebox.showerror("Error", f"Failed to scan folder:\n\n{str(error)}")
+            return
+        
+        if self.file_records:
+            count = len(self.file_records)
             self.count_label.config(text=f"Found {count} PDF file(s) | 0 selected")
             self.log(f"Found {count} PDF file(s)", "success")
             self.rename_btn.config(state=tk.NORMAL)
@@ -718,107 +1314,59 @@ class ModernPDFRenamer:
                 self.toggle_checkbox(item)
     
     def toggle_checkbox(self, item):
-        current_state = self.checkbox_states.get(item, False)
-        new_state = not current_state
-        self.checkbox_states[item] = new_state
-        
-        values = list(self.file_tree.item(item)['values'])
-        values[0] = "[X]" if new_state else "[ ]"
-        self.file_tree.item(item, values=values)
+        if item in self.selected_items:
+            self.selected_items.discard(item)
+            self.file_tree.set(item, "checkbox", "[ ]")
+        else:
+            self.selected_items.add(item)
+            self.file_tree.set(item, "checkbox", "[X]")
         
         self.update_selection_count()
     
     def toggle_all_checkboxes(self):
-        any_checked = any(self.checkbox_states.values())
-        
-        if any_checked:
+        if self.selected_items:
             self.deselect_all()
         else:
             self.select_all()
     
+    def set_checkbox_marks(self, items, mark):
+        # One Tcl loop per batch instead of a Python-to-Tk round trip per row.
+        if items:
+            self.root.tk.call(
+                'apply',
+                ('items mark', f'foreach item $items {{{self.file_tree} set $item checkbox $mark}}'),
+                tuple(items),
+                mark
+            )
+    
     def select_all(self):
-        for item in self.file_tree.get_children():
-            self.checkbox_states[item] = True
-            values = list(self.file_tree.item(item)['values'])
-            values[0] = "[X]"
-            self.file_tree.item(item, values=values)
+        newly_selected = [item for item in self.file_records if item not in self.selected_items]
+        self.selected_items.update(newly_selected)
+        self.set_checkbox_marks(newly_selected, "[X]")
         
         self.update_selection_count()
     
     def deselect_all(self):
-        for item in self.file_tree.get_children():
-            self.checkbox_states[item] = False
-            values = list(self.file_tree.item(item)['values'])
-            values[0] = "[ ]"
-            self.file_tree.item(item, values=values)
+        self.set_checkbox_marks(self.selected_items, "[ ]")
+        self.selected_items.clear()
         
         self.update_selection_count()
     
     def invert_selection(self):
-        for item in self.file_tree.get_children():
-            current_state = self.checkbox_states.get(item, False)
-            new_state = not current_state
-            self.checkbox_states[item] = new_state
-            
-            values = list(self.file_tree.item(item)['values'])
-            values[0] = "[X]" if new_state else "[ ]"
-            self.file_tree.item(item, values=values)
+        previously_selected = self.selected_items
+        self.selected_items = set(self.file_records).difference(previously_selected)
+        self.set_checkbox_marks(previously_selected, "[ ]")
+        self.set_checkbox_marks(self.selected_items, "[X]")
         
         self.update_selection_count()
     
     def update_selection_count(self):
-        total = len(self.pdf_files)
-        selected = sum(1 for checked in self.checkbox_states.values() if checked)
-        self.count_label.config(text=f"Found {total} PDF file(s) | {selected} selected")
+        total = len(self.file_records)
+        self.count_label.config(text=f"Found {total} PDF file(s) | {len(self.selected_items)} selected")
     
     def get_selected_items(self):
-        return [item for item, checked in self.checkbox_states.items() if checked]
-    
-    def extract_consignee_name(self, pdf_path):
-        if pdfplumber is None:
-            return None
-        
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text
-            
-            lines = text.split('\n')
-            for i, line in enumerate(lines):
-                if re.search(r"Consignee\s*\(Ship\s*to\)", line, re.IGNORECASE):
-                    for j in range(i + 1, min(i + 5, len(lines))):
-                        candidate = lines[j].strip()
-                        if candidate:
-                            name = self.clean_consignee_name(candidate)
-                            if name:
-                                return name
-            return None
-            
-        except Exception as e:
-            self.log(f"Error reading PDF: {str(e)}", "error")
-            return None
-    
-    def clean_consignee_name(self, text):
-        patterns = [
-            r"Buyer'?s?\s*Order\s*No\.?",
-            r"Dated",
-            r"GSTIN",
-            r"State\s*Name",
-            r"Invoice\s*No\.?",
-            r"Address",
-            r"Buyer"
-        ]
-        
-        for pattern in patterns:
-            text = re.split(pattern, text, flags=re.IGNORECASE)[0].strip()
-        
-        text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text if text else None
+        # Scan order, so output numbering does not depend on click order.
+        return [item for item in self.file_records if item in self.selected_items]
     
     def start_rename_process(self):
         if self.processing:
@@ -829,85 +1377,81 @@ class ModernPDFRenamer:
             messagebox.showwarning("No Selection", "Please select at least one PDF file")
             return
         
+        if not is_installed("pypdf"):
+            messagebox.showerror("Error", "pypdf library is required. Install with: pip install pypdf")
+            return
+        
+        output_mode = self.output_mode.get()
+        if output_mode == "move" and not messagebox.askyesno(
+            "Move Files",
+            "Move mode removes the selected PDFs from the input folder.\n\nContinue?"
+        ):
+            return
+        
+        workers = self.get_worker_count()
+        
         self.processing = True
         self.rename_btn.config(state=tk.DISABLED)
         self.scan_btn.config(state=tk.DISABLED)
+        self.progress_text.set("")
         self.progress.start(10)
         
-        thread = threading.Thread(target=self.rename_single_page_pdf, args=(selected,))
+        use_layouts = self.use_layouts.get()
+        use_cache = self.use_cache.get()
+        
+        jobs = []
+        for item in selected:
+            record = self.file_records.get(item)
+            if record is None:
+                continue
+            
+            jobs.append((item, record))
+            record.status = "Processing..."
+            self.file_tree.set(item, "status", record.status)
+        
+        thread = threading.Thread(
+            target=self.rename_single_page_pdf,
+            args=(jobs, self.folder_path.get(), workers, use_layouts, use_cache, self.resume_run.get(),
+                  self.get_profile_mode(), output_mode)
+        )
         thread.daemon = True
         thread.start()
     
-    def rename_single_page_pdf(self, selected_items):
-        folder = self.folder_path.get()
+    def rename_single_page_pdf(self, jobs, folder, workers=None, use_layouts=False, use_cache=False, resume=False,
+                               profile=None, output_mode="copy"):
+        """Worker-thread half of the rename; ``jobs`` holds (item, FileRecord) pairs."""
         output_folder = os.path.join(folder, "output")
         
+        def on_status(index, status):
+            self.set_item_status(jobs[index][0], status)
+        
         try:
-            os.makedirs(output_folder, exist_ok=True)
-            self.log(f"Output folder: {output_folder}", "info")
+            summary = rename_pdfs(
+                [record.path for _, record in jobs],
+                output_folder,
+                workers,
+                use_layouts,
+                use_cache,
+                log=self.log,
+                on_status=on_status,
+                display_names=[record.name for _, record in jobs],
+                resume=resume,
+                on_progress=self.report_progress,
+                profile=profile,
+                output_mode=output_mode
+            )
         except Exception as e:
-            self.log(f"Failed to create output folder: {str(e)}", "error")
-            self.finish_processing()
+            self.log(f"Error renaming PDFs: {str(e)}", "error")
+            self.call_in_ui(self.finish_processing)
+            self.call_in_ui(messagebox.showerror, "Error", f"Failed to rename PDFs:\n\n{str(e)}")
             return
         
-        name_counts = defaultdict(int)
-        success_count = 0
-        
-        self.log("\n" + "="*50, "info")
-        self.log("Starting rename process...", "info")
-        self.log("="*50 + "\n", "info")
-        
-        for item in selected_items:
-            values = self.file_tree.item(item)['values']
-            original_name = values[1]
-            
-            pdf_path = None
-            for path in self.pdf_files:
-                if os.path.basename(path) == original_name:
-                    pdf_path = path
-                    break
-            
-            if not pdf_path:
-                continue
-            
-            self.log(f"Processing: {original_name}", "info")
-            self.file_tree.item(item, values=(values[0], original_name, "Processing..."))
-            
-            consignee_name = self.extract_consignee_name(pdf_path)
-            
-            if not consignee_name:
-                self.log(f"  Could not find consignee name", "warning")
-                self.file_tree.item(item, values=(values[0], original_name, "Failed"))
-                continue
-            
-            name_counts[consignee_name] += 1
-            count = name_counts[consignee_name]
-            
-            if count > 1:
-                new_name = f"{consignee_name} - {count}.pdf"
-            else:
-                new_name = f"{consignee_name}.pdf"
-            
-            new_path = os.path.join(output_folder, new_name)
-            
-            try:
-                shutil.copy2(pdf_path, new_path)
-                self.log(f"  Renamed to: {new_name}", "success")
-                self.file_tree.item(item, values=(values[0], original_name, "Done"))
-                success_count += 1
-            except Exception as e:
-                self.log(f"  Error: {str(e)}", "error")
-                self.file_tree.item(item, values=(values[0], original_name, "Error"))
-        
-        self.log("\n" + "="*50, "info")
-        self.log(f"Complete! Successfully renamed {success_count} file(s)", "success")
-        self.log("="*50 + "\n", "info")
-        
-        self.finish_processing()
+        self.call_in_ui(self.finish_processing)
         
-        messagebox.showinfo(
+        self.call_in_ui(
+            messagebox.showinfo,
             "Complete",
-            f"Successfully renamed {success_count} PDF file(s)!\n\nOutput: {output_folder}"
+            f"Successfully renamed {summary['succeeded']} PDF file(s)!\n\nOutput: {output_folder}"
         )
     
     def start_pdf_split_process(self):
@@ -916,103 +1460,49 @@ class ModernPDFRenamer:
             messagebox.showerror("Error", "Please select a valid PDF file")
             return
         
-        if PdfReader is None or PdfWriter is None:
+        if not is_installed("pypdf"):
             messagebox.showerror("Error", "pypdf library is required. Install with: pip install pypdf")
             return
         
         self.processing = True
         self.process_btn.config(state=tk.DISABLED)
+        self.progress_text.set("")
         self.progress.start(10)
         
-        thread = threading.Thread(target=self.split_and_rename_multi_page_pdf, args=(file_path,))
+        workers = self.get_worker_count()
+        sharded = self.sharded_split.get()
+        use_layouts = self.use_layouts.get()
+        
+        thread = threading.Thread(
+            target=self.split_and_rename_multi_page_pdf,
+            args=(file_path, workers, sharded, use_layouts, self.get_profile_mode())
+        )
         thread.daemon = True
         thread.start()
     
-    def split_and_rename_multi_page_pdf(self, pdf_path):
+    def split_and_rename_multi_page_pdf(self, pdf_path, workers=None, sharded=False, use_layouts=False, profile=None):
         output_folder = os.path.join(os.path.dirname(pdf_path), "output")
         
         try:
-            os.makedirs(output_folder, exist_ok=True)
-            self.log(f"Output folder: {output_folder}", "info")
+            summary = split_pdf(pdf_path, output_folder, workers, sharded, use_layouts, log=self.log,
+                                on_progress=self.report_progress, profile=profile)
+        except ProcessingError as e:
+            self.log(str(e), "error")
+            self.call_in_ui(self.finish_processing)
+            return
         except Exception as e:
-            self.log(f"Failed to create output folder: {str(e)}", "error")
-            self.finish_processing()
+            self.log(f"Error processing PDF: {str(e)}", "error")
+            self.call_in_ui(self.finish_processing)
+            self.call_in_ui(messagebox.showerror, "Error", f"Failed to process PDF:\n\n{str(e)}")
             return
         
-        self.log("\n" + "="*50, "info")
-        self.log("Starting PDF split & rename process...", "info")
-        self.log(f"Source: {os.path.basename(pdf_path)}", "info")
-        self.log("="*50 + "\n", "info")
+        self.call_in_ui(self.finish_processing)
         
-        try:
-            reader = PdfReader(pdf_path)
-            total_pages = len(reader.pages)
-            self.log(f"Total pages: {total_pages}", "info")
-            
-            name_counts = defaultdict(int)
-            success_count = 0
-            
-            for page_num in range(total_pages):
-                self.log(f"\nProcessing page {page_num + 1}/{total_pages}...", "info")
-                
-                writer = PdfWriter()
-                writer.add_page(reader.pages[page_num])
-                
-                temp_path = os.path.join(output_folder, f"temp_page_{page_num + 1}.pdf")
-                with open(temp_path, 'wb') as temp_file:
-                    writer.write(temp_file)
-                
-                consignee_name = self.extract_consignee_name(temp_path)
-                
-                if consignee_name:
-                    name_counts[consignee_name] += 1
-                    count = name_counts[consignee_name]
-                    
-                    if count > 1:
-                        new_name = f"{consignee_name} - {count}.pdf"
-                    else:
-                        new_name = f"{consignee_name}.pdf"
-                    
-                    final_path = os.path.join(output_folder, new_name)
-                    
-                    try:
-                        os.rename(temp_path, final_path)
-                        self.log(f"  Saved as: {new_name}", "success")
-                        success_count += 1
-                    except Exception as e:
-                        self.log(f"  Error renaming: {str(e)}", "error")
-                        try:
-                            os.remove(temp_path)
-                        except:
-                            pass
-                else:
-                    fallback_name = f"Page_{page_num + 1}.pdf"
-                    fallback_path = os.path.join(output_folder, fallback_name)
-                    try:
-                        os.rename(temp_path, fallback_path)
-                        self.log(f"  No consignee found, saved as: {fallback_name}", "warning")
-                    except Exception as e:
-                        self.log(f"  Error: {str(e)}", "error")
-                        try:
-                            os.remove(temp_path)
-                        except:
-                            pass
-            
-            self.log("\n" + "="*50, "info")
-            self.log(f"Complete! Successfully processed {success_count}/{total_pages} page(s)", "success")
-            self.log("="*50 + "\n", "info")
-            
-            self.finish_processing()
-            
-            messagebox.showinfo(
-                "Complete",
-                f"Split and renamed {success_count} out of {total_pages} pages!\n\nOutput: {output_folder}"
-            )
-            
-        except Exception as e:
-            self.log(f"Error processing PDF: {str(e)}", "error")
-            self.finish_processing()
-            messagebox.showerror("Error", f"Failed to process PDF:\n\n{str(e)}")
+        self.call_in_ui(
+            messagebox.showinfo,
+            "Complete",
+            f"Split and renamed {summary['succeeded']} out of {summary['total']} pages!\n\nOutput: {output_folder}"
+        )
     
     def start_excel_split_process(self):
         file_path = self.file_path.get()
@@ -1020,107 +1510,117 @@ class ModernPDFRenamer:
             messagebox.showerror("Error", "Please select a valid Excel file")
             return
         
-        if pd is None:
+        if not is_installed("pandas"):
             messagebox.showerror("Error", "pandas library is required. Install with: pip install pandas openpyxl")
             return
         
         self.processing = True
         self.process_btn.config(state=tk.DISABLED)
+        self.progress_text.set("")
         self.progress.start(10)
         
-        thread = threading.Thread(target=self.split_excel_by_party_and_comm, args=(file_path,))
+        streaming = self.streaming_excel.get()
+        engine = self.excel_engine.get()
+        workers = self.get_worker_count()
+        use_cache = self.use_table_cache.get()
+        
+        thread = threading.Thread(
+            target=self.split_excel_by_party_and_comm,
+            args=(file_path, streaming, engine, workers, use_cache, self.get_profile_mode())
+        )
         thread.daemon = True
         thread.start()
     
-    def split_excel_by_party_and_comm(self, excel_path):
+    def split_excel_by_party_and_comm(self, excel_path, streaming=False, engine="auto", workers=None, use_cache=False,
+                                      profile=None):
         output_folder = os.path.join(os.path.dirname(excel_path), "output")
         
         try:
-            os.makedirs(output_folder, exist_ok=True)
-            self.log(f"Output folder: {output_folder}", "info")
+            summary = split_excel(excel_path, output_folder, streaming, engine, workers, use_cache, log=self.log,
+                                  on_progress=self.report_progress, profile=profile)
+        except ProcessingError as e:
+            self.log(str(e), "error")
+            self.call_in_ui(self.finish_processing)
+            self.call_in_ui(messagebox.showerror, "Error", str(e))
+            return
         except Exception as e:
-            self.log(f"Failed to create output folder: {str(e)}", "error")
-            self.finish_processing()
+            self.log(f"Error processing Excel: {str(e)}", "error")
+            self.call_in_ui(self.finish_processing)
+            self.call_in_ui(messagebox.showerror, "Error", f"Failed to process Excel file:\n\n{str(e)}")
             return
         
-        self.log("\n" + "="*50, "info")
-        self.log("Starting Excel split & rename process...", "info")
-        self.log(f"Source: {os.path.basename(excel_path)}", "info")
-        self.log("="*50 + "\n", "info")
+        self.call_in_ui(self.finish_processing)
+        
+        self.call_in_ui(
+            messagebox.showinfo,
+            "Complete",
+            f"Successfully split into {summary['succeeded']} Excel file(s)!\n\nOutput: {output_folder}"
+        )
+    
+    def toggle_watch(self):
+        if self.watch_stop:
+            self.watch_stop.set()
+            self.watch_btn.config(text="Stopping...", state=tk.DISABLED)
+            return
+        
+        if self.processing:
+            return
+        
+        folder = self.folder_path.get()
+        if not folder or not os.path.isdir(folder):
+            messagebox.showerror("Error", "Please select a valid folder")
+            return
+        
+        if not is_installed("pdfplumber"):
+            messagebox.showerror("Error", "pdfplumber library is required. Install with: pip install pdfplumber")
+            return
+        
+        self.processing = True
+        self.watch_stop = threading.Event()
+        self.rename_btn.config(state=tk.DISABLED)
+        self.scan_btn.config(state=tk.DISABLED)
+        self.watch_btn.config(text="Stop Watching")
+        self.progress_text.set("")
+        self.progress.start(10)
+        
+        watcher = FolderWatcher(
+            folder,
+            workers=self.get_worker_count(),
+            recursive=self.recursive_scan.get(),
+            include=split_patterns(self.include_patterns.get()) or ["*.pdf"],
+            exclude=split_patterns(self.exclude_patterns.get()),
+            log=self.log
+        )
+        
+        thread = threading.Thread(
+            target=self.watch_folder,
+            args=(watcher, self.watch_stop, self.use_layouts.get())
+        )
+        thread.daemon = True
+        thread.start()
+    
+    def watch_folder(self, watcher, stop, use_layouts=False):
+        if use_layouts:
+            profiles = open_layout_profiles(self.log)
+            watcher.layouts = profiles.active_bboxes() if profiles else None
         
         try:
-            if excel_path.lower().endswith('.csv'):
-                df = pd.read_csv(excel_path)
-            else:
-                df = pd.read_excel(excel_path)
-            
-            self.log(f"Total rows: {len(df)}", "info")
-            self.log(f"Columns: {', '.join(df.columns.tolist())}", "info")
-            
-            party_col = None
-            comm_col = None
-            
-            for col in df.columns:
-                col_lower = col.lower().strip()
-                if 'party' in col_lower and 'name' in col_lower:
-                    party_col = col
-                if 'comm' in col_lower and 'group' in col_lower:
-                    comm_col = col
-            
-            if not party_col:
-                self.log("Could not find 'Party Name' column", "error")
-                self.finish_processing()
-                messagebox.showerror("Error", "Could not find 'Party Name' column in the Excel file")
-                return
-            
-            if not comm_col:
-                self.log("Could not find 'Comm grouping' column", "error")
-                self.finish_processing()
-                messagebox.showerror("Error", "Could not find 'Comm grouping' column in the Excel file")
-                return
-            
-            self.log(f"Using columns: '{party_col}' and '{comm_col}'", "success")
-            
-            grouped = df.groupby([party_col, comm_col])
-            
-            success_count = 0
-            
-            for (party, comm), group_df in grouped:
-                party_clean = re.sub(r'[^a-zA-Z0-9\s]', '', str(party))
-                party_clean = re.sub(r'\s+', ' ', party_clean).strip()
-                
-                comm_clean = re.sub(r'[^a-zA-Z0-9\s]', '', str(comm))
-                comm_clean = re.sub(r'\s+', ' ', comm_clean).strip()
-                
-                filename = f"{party_clean}_{comm_clean}.xlsx"
-                output_path = os.path.join(output_folder, filename)
-                
-                try:
-                    group_df.to_excel(output_path, index=False, engine='openpyxl')
-                    self.log(f"Created: {filename} ({len(group_df)} rows)", "success")
-                    success_count += 1
-                except Exception as e:
-                    self.log(f"Error creating {filename}: {str(e)}", "error")
-            
-            self.log("\n" + "="*50, "info")
-            self.log(f"Complete! Created {success_count} Excel file(s)", "success")
-            self.log("="*50 + "\n", "info")
-            
-            self.finish_processing()
-            
-            messagebox.showinfo(
-                "Complete",
-                f"Successfully split into {success_count} Excel file(s)!\n\nOutput: {output_folder}"
-            )
-            
+            watcher.run(stop)
         except Exception as e:
-            self.log(f"Error processing Excel: {str(e)}", "error")
-            self.finish_processing()
-            messagebox.showerror("Error", f"Failed to process Excel file:\n\n{str(e)}")
+            self.log(f"Watch mode stopped: {str(e)}", "error")
+        
+        self.call_in_ui(self.finish_watch)
+    
+    def finish_watch(self):
+        self.watch_stop = None
+        if self.current_mode == "pdf_rename":
+            self.watch_btn.config(text="Watch Folder", state=tk.NORMAL)
+        self.finish_processing()
     
     def finish_processing(self):
         self.processing = False
         self.progress.stop()
+        self.progress.config(mode='indeterminate', value=0)
         
         if self.current_mode == "pdf_rename":
             self.rename_btn.config(state=tk.NORMAL)
@@ -1154,4 +1654,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""Peak memory and time of the DataFrame vs streaming Excel split.
+
+Each mode runs in a fresh interpreter so its peak RSS is measured on its
+own (Linux/macOS only: uses resource.getrusage).
+
+Usage: python benchmarks/bench_excel_stream.py [row_count] [xlsx|csv]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def split_dataframe(path, output_folder):
+    import pandas as pd
+
+    from engine import find_split_columns, sanitize_lookup
+
+    df = pd.read_csv(path) if path.endswith('.csv') else pd.read_excel(path)
+    party_col, comm_col = find_split_columns(df.columns)
+    party_names = sanitize_lookup(df[party_col])
+    comm_names = sanitize_lookup(df[comm_col])
+    for (party, comm), group_df in df.groupby([party_col, comm_col]):
+        filename = f"{party_names[party]}_{comm_names[comm]}.xlsx"
+        group_df.to_excel(os.path.join(output_folder, filename), index=False, engine='openpyxl')
+
+
+def split_streaming(path, output_folder):
+    from engine import GroupSpool, SheetRowReader, find_split_columns, sanitize_name, spool_groups, write_rows_xlsx
+
+    with SheetRowReader(path) as reader, tempfile.TemporaryDirectory() as spill_dir:
+        party_col, comm_col = find_split_columns(reader.header)
+        spool = GroupSpool(spill_dir)
+        spool_groups(reader, reader.header.index(party_col), reader.header.index(comm_col), spool)
+        for party, comm in spool.keys():
+            filename = f"{sanitize_name(party)}_{sanitize_name(comm)}.xlsx"
+            write_rows_xlsx(os.path.join(output_folder, filename), reader.header, spool.rows((party, comm)))
+            spool.discard((party, comm))
+
+
+def child(mode, path, output_folder):
+    start = time.perf_counter()
+    {"dataframe": split_dataframe, "streaming": split_streaming}[mode](path, output_folder)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024
+    print(f"{elapsed:.2f} {peak}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(*sys.argv[2:5])
+        return
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from ledger import write_ledger_csv, write_ledger_xlsx
+
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    kind = sys.argv[2] if len(sys.argv) > 2 else "xlsx"
+
+    with tempfile.TemporaryDirectory() as folder:
+        source = os.path.join(folder, f"ledger.{kind}")
+        (write_ledger_csv if kind == "csv" else write_ledger_xlsx)(source, row_count)
+        print(f"{row_count}-row ledger ({kind}, {os.path.getsize(source) / 1e6:.1f} MB)")
+
+        for mode in ("dataframe", "streaming"):
+            output_folder = os.path.join(folder, mode)
+            os.makedirs(output_folder)
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", mode, source, output_folder],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            elapsed, peak_kb = float(out[0]), int(out[1])
+            files = len(os.listdir(output_folder))
+            print(f"{mode:>10}: {elapsed:7.2f}s  peak RSS {peak_kb / 1024:7.1f} MB  {files} files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Throughput of the Excel split writer engines.
+
+Writes every (party, comm) group of two generated ledgers, one with many
+small groups and one with a few large groups, with each engine.
+
+Usage: python benchmarks/bench_excel_writers.py [row_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from engine import excel_cells, find_split_columns, resolve_excel_engine, write_rows_xlsx  # noqa: E402
+from ledger import HEADER, ledger_rows  # noqa: E402
+
+ENGINES = ("pandas", "openpyxl", "xlsxwriter")
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    datasets = (
+        ("many small groups", pd.DataFrame(ledger_rows(row_count, party_count=row_count // 30), columns=HEADER)),
+        ("few large groups", pd.DataFrame(ledger_rows(row_count, party_count=2), columns=HEADER)),
+    )
+
+    for label, df in datasets:
+        party_col, comm_col = find_split_columns(df.columns)
+        groups = list(df.groupby([party_col, comm_col]).indices.values())
+        header = list(df.columns)
+        print(f"{label}: {len(df)} rows in {len(groups)} groups")
+
+        for engine in ENGINES:
+            if resolve_excel_engine(engine) != engine:
+                print(f"{engine:>12}: not installed")
+                continue
+            with tempfile.TemporaryDirectory() as folder:
+                start = time.perf_counter()
+                cells = excel_cells(df) if engine != "pandas" else None
+                for index, positions in enumerate(groups):
+                    output_path = os.path.join(folder, f"{index}.xlsx")
+                    if engine == "pandas":
+                        df.iloc[positions].to_excel(output_path, index=False, engine='openpyxl')
+                    else:
+                        write_rows_xlsx(output_path, header, cells[positions].tolist(), engine, len(positions))
+                elapsed = time.perf_counter() - start
+            print(f"{engine:>12}: {elapsed:7.2f}s  {len(groups) / elapsed:8.1f} files/s  {len(df) / elapsed:9.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
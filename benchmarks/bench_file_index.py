@@ -0,0 +1,74 @@
+"""Selected-item to path lookup: linear basename scan vs the FileRecord index.
+
+The legacy rename loop looked up each selected row's file name and scanned
+the whole file list comparing basenames. With every file selected that is
+quadratic, so above 5,000 files the legacy timing is measured on an evenly
+spaced sample of rows and scaled up (marked "est.").
+
+Usage: python benchmarks/bench_file_index.py [file_count ...]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import FileRecord  # noqa: E402
+
+LEGACY_SAMPLE = 2000
+
+
+def build(file_count, folder="/invoices"):
+    names = [f"invoice_{i:06d}.pdf" for i in range(file_count)]
+    paths = [os.path.join(folder, name) for name in names]
+    items = [f"I{i:06X}" for i in range(file_count)]
+    rows = {item: ["[X]", name, "Ready"] for item, name in zip(items, names)}
+    records = {
+        item: FileRecord(path, name, 0, 0)
+        for item, path, name in zip(items, paths, names)
+    }
+    return items, paths, rows, records
+
+
+def legacy_lookup(items, paths, rows):
+    found = []
+    for item in items:
+        original_name = rows[item][1]
+        pdf_path = None
+        for path in paths:
+            if os.path.basename(path) == original_name:
+                pdf_path = path
+                break
+        found.append(pdf_path)
+    return found
+
+
+def indexed_lookup(items, records):
+    return [records[item].path for item in items]
+
+
+def main():
+    file_counts = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    print(f"{'files':>8} {'legacy s':>12} {'indexed s':>10} {'speedup':>10}")
+
+    for file_count in file_counts:
+        items, paths, rows, records = build(file_count)
+
+        step = max(1, file_count // LEGACY_SAMPLE) if file_count > 5000 else 1
+        sample = items[::step]
+        start = time.perf_counter()
+        expected = legacy_lookup(sample, paths, rows)
+        legacy = (time.perf_counter() - start) * len(items) / len(sample)
+
+        start = time.perf_counter()
+        found = indexed_lookup(items, records)
+        indexed = time.perf_counter() - start
+
+        if found[::step] != expected:
+            raise SystemExit(f"{file_count} files: indexed lookup returned different paths")
+        label = f"{legacy:.3f}" + (" est." if step > 1 else "")
+        print(f"{file_count:>8} {label:>12} {indexed:>10.4f} {legacy / indexed:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
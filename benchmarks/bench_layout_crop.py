@@ -0,0 +1,49 @@
+"""Cropped (layout profile) vs full-page consignee extraction.
+
+A profile is learned from the first few invoices, then every invoice is
+scanned with and without it. Layout profiles only apply to the pdfplumber
+tier, so the pypdf tier is switched off here.
+
+Usage: python benchmarks/bench_layout_crop.py [file_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import LayoutProfiles, scan_consignee_name  # noqa: E402
+from corpus import generate_single_page_corpus  # noqa: E402
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_single_page_corpus(folder, file_count)
+        profiles = LayoutProfiles(os.path.join(folder, "layouts.json"))
+        for path in paths[:profiles.learn_samples]:
+            result = scan_consignee_name(path, {}, fast=False)
+            if result['layout']:
+                profiles.learn(*result['layout'])
+        layouts = profiles.active_bboxes()
+        print(f"{file_count} invoices, learned profiles: {layouts}")
+
+        timings = {}
+        names = {}
+        for label, options in (("full-page", None), ("cropped", layouts)):
+            start = time.perf_counter()
+            results = [scan_consignee_name(path, options, fast=False) for path in paths]
+            timings[label] = time.perf_counter() - start
+            names[label] = [result['name'] for result in results]
+            cropped = sum(result['cropped'] for result in results)
+            print(f"{label:>10}: {timings[label]:7.2f}s  ({file_count / timings[label]:.1f} files/s, {cropped} cropped)")
+
+        if names["full-page"] != names["cropped"]:
+            raise SystemExit("cropped extraction returned different names")
+        print(f"speedup: {timings['full-page'] / timings['cropped']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Micro-benchmark and equivalence check for normalize.py.
+
+Runs the original per-pattern implementations and the precompiled ones over
+the same generated consignee strings, exits non-zero on the first string
+where their output differs, and reports the speedup.
+
+Usage: python benchmarks/bench_normalize.py [string_count]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from normalize import clean_consignee_name, sanitize_name  # noqa: E402
+from corpus import CONSIGNEES  # noqa: E402
+
+
+def legacy_clean_consignee_name(text):
+    patterns = [
+        r"Buyer'?s?\s*Order\s*No\.?",
+        r"Dated",
+        r"GSTIN",
+        r"State\s*Name",
+        r"Invoice\s*No\.?",
+        r"Address",
+        r"Buyer"
+    ]
+
+    for pattern in patterns:
+        text = re.split(pattern, text, flags=re.IGNORECASE)[0].strip()
+
+    text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    return text if text else None
+
+
+def legacy_sanitize_name(value):
+    value = re.sub(r'[^a-zA-Z0-9\s]', '', str(value))
+    return re.sub(r'\s+', ' ', value).strip()
+
+
+SUFFIXES = [
+    "", "  Buyer's Order No. PO-{n}", " Dated {n}-04-2025", " GSTIN 24AAACS{n}A1Z5",
+    " State Name : Gujarat", " Invoice No.{n}", " Address: Plot {n}", " Buyer",
+    " BUYERS ORDER NO {n}", " dated", " (Unit-{n})", " & Sons", " Pvt. Ltd.",
+]
+NOISE = ["", " ", "\t", "  ", "/", "-", ".", ",", " ", "é", "–", "ſ", "K"]
+TRICKY = [
+    "AddresState Name", "BuyerDated", "Buyer's Order No.Dated", "GSTINvoice No",
+    "StateName Address", "Invoice NoBuyer", "  ", "", "ſtate name", "KRISHNA",
+]
+
+
+def generate(count, seed=11):
+    rng = random.Random(seed)
+    strings = list(TRICKY)
+    while len(strings) < count:
+        n = rng.randint(1, 9999)
+        text = rng.choice(NOISE) + rng.choice(CONSIGNEES) + rng.choice(NOISE)
+        for _ in range(rng.randint(0, 2)):
+            text += rng.choice(SUFFIXES).format(n=n) + rng.choice(NOISE)
+        if rng.random() < 0.05:
+            text = text.upper()
+        strings.append(text)
+    return strings
+
+
+def timed(function, strings):
+    start = time.perf_counter()
+    results = [function(text) for text in strings]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    strings = generate(count)
+    print(f"{len(strings)} consignee strings")
+
+    pairs = (
+        ("clean_consignee_name", legacy_clean_consignee_name, clean_consignee_name),
+        ("sanitize_name", legacy_sanitize_name, sanitize_name),
+    )
+    for label, legacy, current in pairs:
+        legacy_time, expected = timed(legacy, strings)
+        current_time, actual = timed(current, strings)
+        for text, want, got in zip(strings, expected, actual):
+            if want != got:
+                raise SystemExit(f"{label} differs for {text!r}: {want!r} != {got!r}")
+        print(f"{label:>22}: legacy {legacy_time:6.2f}s  new {current_time:6.2f}s  "
+              f"speedup {legacy_time / current_time:.2f}x  (outputs identical)")
+
+
+if __name__ == "__main__":
+    main()
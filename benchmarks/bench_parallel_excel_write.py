@@ -0,0 +1,47 @@
+"""Scaling of the parallel Excel split writer at 1/4/8 workers.
+
+Usage: python benchmarks/bench_parallel_excel_write.py [row_count] [engine]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from engine import default_worker_count, excel_cells, find_split_columns, iter_group_writes, resolve_excel_engine  # noqa: E402
+from ledger import HEADER, ledger_rows  # noqa: E402
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else 60000
+    engine = resolve_excel_engine(sys.argv[2] if len(sys.argv) > 2 else "auto")
+
+    df = pd.DataFrame(ledger_rows(row_count, party_count=500), columns=HEADER)
+    party_col, comm_col = find_split_columns(df.columns)
+    groups = list(df.groupby([party_col, comm_col]).indices.values())
+    header = list(df.columns)
+    cells = excel_cells(df)
+    print(f"{row_count} rows in {len(groups)} groups, engine {engine}, {default_worker_count()} CPU(s)")
+    print(f"{'workers':>8} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+
+    baseline = None
+    for workers in (1, 4, 8):
+        with tempfile.TemporaryDirectory() as folder:
+            jobs = (
+                (index, (os.path.join(folder, f"{index}.xlsx"), header, cells[positions].tolist(), engine))
+                for index, positions in enumerate(groups)
+            )
+            start = time.perf_counter()
+            errors = [error for _, (_, error, _) in iter_group_writes(jobs, workers) if error]
+            elapsed = time.perf_counter() - start
+            if errors:
+                raise SystemExit(errors[0])
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {len(groups) / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
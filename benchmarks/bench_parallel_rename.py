@@ -0,0 +1,44 @@
+"""Compare consignee extraction throughput at different worker counts.
+
+Usage: python benchmarks/bench_parallel_rename.py [file_count]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import default_worker_count, iter_consignee_names, iter_in_order  # noqa: E402
+from corpus import generate_single_page_corpus  # noqa: E402
+
+
+def run(paths, workers):
+    start = time.perf_counter()
+    names = [result['name'] for _, result in iter_in_order(iter_consignee_names(paths, workers))]
+    return time.perf_counter() - start, names
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    worker_counts = sorted({1, 2, 4, default_worker_count()})
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_single_page_corpus(folder, file_count)
+        print(f"{file_count} single-page invoices, {default_worker_count()} CPU(s)")
+        print(f"{'workers':>8} {'seconds':>9} {'files/s':>9} {'speedup':>8}")
+
+        baseline = None
+        reference = None
+        for workers in worker_counts:
+            elapsed, names = run(paths, workers)
+            if reference is None:
+                reference = names
+            elif names != reference:
+                raise SystemExit(f"workers={workers} produced different names than the serial run")
+            baseline = baseline or elapsed
+            print(f"{workers:>8} {elapsed:>9.2f} {file_count / elapsed:>9.1f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
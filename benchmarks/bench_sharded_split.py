@@ -0,0 +1,48 @@
+"""Serial vs sharded multi-page split: timings and a determinism check.
+
+The sharded run must produce exactly the same set of output file names
+(including the "name - N.pdf" suffixes) as the serial run; the script exits
+non-zero otherwise.
+
+Usage: python benchmarks/bench_sharded_split.py [page_count] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import default_worker_count, iter_split_pages, iter_split_pages_sharded  # noqa: E402
+from corpus import generate_multi_page_pdf  # noqa: E402
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else default_worker_count()
+
+    with tempfile.TemporaryDirectory() as folder:
+        pdf_path = generate_multi_page_pdf(os.path.join(folder, "consolidated.pdf"), page_count)
+        print(f"{page_count}-page consolidated invoice, {workers} worker(s)")
+
+        runs = (
+            ("serial", lambda out: iter_split_pages(pdf_path, out)),
+            ("sharded", lambda out: iter_split_pages_sharded(pdf_path, out, workers)),
+        )
+        listings = {}
+        for label, split in runs:
+            output_folder = os.path.join(folder, label)
+            os.makedirs(output_folder)
+            start = time.perf_counter()
+            outputs = [result['output'] for result in split(output_folder)]
+            elapsed = time.perf_counter() - start
+            listings[label] = (outputs, sorted(os.listdir(output_folder)))
+            print(f"{label:>8}: {elapsed:7.2f}s  ({page_count / elapsed:.1f} pages/s)")
+
+        if listings["serial"] != listings["sharded"]:
+            raise SystemExit("sharded split produced different file names than the serial split")
+        print("file names identical")
+
+
+if __name__ == "__main__":
+    main()
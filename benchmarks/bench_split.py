@@ -0,0 +1,65 @@
+"""Before/after timings for multi-page split & rename.
+
+"temp-file" reproduces the original pipeline (write every page to
+temp_page_N.pdf, reopen it with pdfplumber, rename); "in-memory" is
+engine.iter_split_pages.
+
+Usage: python benchmarks/bench_split.py [page_count]
+"""
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pypdf import PdfReader, PdfWriter  # noqa: E402
+
+from engine import extract_consignee_name, iter_split_pages, next_output_name  # noqa: E402
+from corpus import generate_multi_page_pdf  # noqa: E402
+
+
+def split_with_temp_files(pdf_path, output_folder):
+    reader = PdfReader(pdf_path)
+    name_counts = defaultdict(int)
+    outputs = []
+    for page_num in range(len(reader.pages)):
+        writer = PdfWriter()
+        writer.add_page(reader.pages[page_num])
+        temp_path = os.path.join(output_folder, f"temp_page_{page_num + 1}.pdf")
+        with open(temp_path, 'wb') as temp_file:
+            writer.write(temp_file)
+        name = extract_consignee_name(temp_path)
+        new_name = next_output_name(name_counts, name) if name else f"Page_{page_num + 1}.pdf"
+        os.rename(temp_path, os.path.join(output_folder, new_name))
+        outputs.append(new_name)
+    return outputs
+
+
+def split_in_memory(pdf_path, output_folder):
+    return [result['output'] for result in iter_split_pages(pdf_path, output_folder)]
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with tempfile.TemporaryDirectory() as folder:
+        pdf_path = generate_multi_page_pdf(os.path.join(folder, "consolidated.pdf"), page_count)
+        print(f"{page_count}-page consolidated invoice")
+
+        outputs = {}
+        for label, split in (("temp-file", split_with_temp_files), ("in-memory", split_in_memory)):
+            output_folder = os.path.join(folder, label)
+            os.makedirs(output_folder)
+            start = time.perf_counter()
+            outputs[label] = split(pdf_path, output_folder)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>10}: {elapsed:7.2f}s  ({page_count / elapsed:.1f} pages/s)")
+
+        if outputs["temp-file"] != outputs["in-memory"]:
+            raise SystemExit("in-memory split produced different file names")
+
+
+if __name__ == "__main__":
+    main()
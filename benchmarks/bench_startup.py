@@ -0,0 +1,93 @@
+"""Start-up time of the desktop app, as a regression check.
+
+Imports ``app`` in fresh interpreters under ``python -X importtime`` and
+reports the median import time and the slowest imports. Exits non-zero if
+the median exceeds the threshold or if any heavy library (pandas,
+pdfplumber, pypdf, openpyxl, xlsxwriter, PIL, watchdog) was actually loaded
+during start-up; they should only load when a workflow first needs them.
+When a display is available it also times building the main window.
+
+Usage: python benchmarks/bench_startup.py [max_import_ms] [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "pdfplumber", "pypdf", "openpyxl", "xlsxwriter", "PIL", "watchdog")
+
+# A lazily imported module sits in sys.modules from the start, but its
+# submodules only appear once it has really been loaded.
+LOADED_CHECK = (
+    "import sys, app; "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} "
+    "if any(name.startswith(m + '.') for name in sys.modules)))"
+)
+
+WINDOW_CHECK = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+try:
+    root = tk.Tk()
+except tk.TclError:
+    raise SystemExit(3)
+from app import ModernPDFRenamer
+ModernPDFRenamer(root)
+root.update()
+print(time.perf_counter() - start)
+root.destroy()
+"""
+
+
+def run_python(args):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+
+
+def import_times():
+    """``{module: cumulative_us}`` for one ``import app`` in a fresh interpreter."""
+    result = run_python(["-X", "importtime", "-c", "import app"])
+    if result.returncode:
+        raise SystemExit(f"import app failed:\n{result.stderr}")
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    max_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 500
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    samples = [import_times() for _ in range(runs)]
+    median_ms = statistics.median(times["app"] for times in samples) / 1000
+    print(f"import app: {median_ms:.0f} ms median of {runs} (threshold {max_ms:.0f} ms)")
+
+    slowest = sorted(samples[-1].items(), key=lambda item: item[1], reverse=True)[1:6]
+    for name, cumulative in slowest:
+        print(f"  {cumulative / 1000:7.1f} ms  {name}")
+
+    loaded = run_python(["-c", LOADED_CHECK]).stdout.strip()
+    window = run_python(["-c", WINDOW_CHECK])
+    if window.returncode == 0:
+        print(f"main window ready: {float(window.stdout) * 1000:.0f} ms")
+    else:
+        print("main window: not timed (no display available)")
+
+    failures = []
+    if median_ms > max_ms:
+        failures.append(f"import took {median_ms:.0f} ms (threshold {max_ms:.0f} ms)")
+    if loaded:
+        failures.append(f"heavy libraries loaded at start-up: {loaded}")
+    if failures:
+        raise SystemExit("; ".join(failures))
+    print("no heavy libraries loaded at start-up")
+
+
+if __name__ == "__main__":
+    main()
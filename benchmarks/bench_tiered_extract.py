@@ -0,0 +1,64 @@
+"""pdfplumber-only vs tiered (pypdf first) consignee extraction.
+
+Scans every invoice both ways, reports files/s and how often each tier
+found the name, and exits non-zero if the tiered extractor returns a
+different name for any file. Pass a folder to run on real invoices instead
+of the generated corpus.
+
+Usage: python benchmarks/bench_tiered_extract.py [file_count | invoice_folder]
+"""
+import glob
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import describe_tiers, scan_consignee_name, tier_counts  # noqa: E402
+from corpus import generate_single_page_corpus  # noqa: E402
+
+
+def run(paths):
+    timings = {}
+    results = {}
+    for label, fast in (("pdfplumber", False), ("tiered", True)):
+        start = time.perf_counter()
+        results[label] = [scan_consignee_name(path, fast=fast) for path in paths]
+        timings[label] = time.perf_counter() - start
+        print(f"{label:>10}: {timings[label]:7.2f}s  ({len(paths) / timings[label]:.1f} files/s)")
+
+    tiers = tier_counts()
+    for result in results["tiered"]:
+        tiers[result['tier'] or "none"] += 1
+    print(f"tiers: {describe_tiers(tiers)}")
+
+    mismatches = [
+        (path, slow['name'], fast['name'])
+        for path, slow, fast in zip(paths, results["pdfplumber"], results["tiered"])
+        if slow['name'] != fast['name']
+    ]
+    for path, want, got in mismatches[:10]:
+        print(f"  {os.path.basename(path)}: pdfplumber {want!r}, tiered {got!r}")
+    if mismatches:
+        raise SystemExit(f"tiered extraction returned different names for {len(mismatches)} file(s)")
+    print(f"speedup: {timings['pdfplumber'] / timings['tiered']:.2f}x  (names identical)")
+
+
+def main():
+    arg = sys.argv[1] if len(sys.argv) > 1 else "200"
+
+    if os.path.isdir(arg):
+        paths = sorted(glob.glob(os.path.join(arg, "*.pdf")))
+        print(f"{len(paths)} invoices from {arg}")
+        run(paths)
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_single_page_corpus(folder, int(arg))
+        print(f"{len(paths)} generated invoices")
+        run(paths)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Log/status throughput: direct Tk calls per message vs the queued UI bridge.
+
+The legacy path inserts each log line, scrolls and calls update_idletasks,
+then sets the Treeview row, once per file. The bridge path has a worker
+thread push the same events onto the app's queue while the main loop drains
+them every UI_DRAIN_INTERVAL_MS. Both runs finish once every line and row
+is on screen. Needs a display; exits with a message otherwise.
+
+Usage: python benchmarks/bench_ui_bridge.py [file_count]
+"""
+import os
+import sys
+import threading
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import ModernPDFRenamer  # noqa: E402
+
+LINES_PER_FILE = 2
+
+
+def fill_tree(app, file_count):
+    app.file_tree.delete(*app.file_tree.get_children())
+    app.log_text.delete("1.0", tk.END)
+    return [
+        app.file_tree.insert("", tk.END, values=("[X]", f"invoice_{i:05d}.pdf", "Processing..."))
+        for i in range(file_count)
+    ]
+
+
+def run_legacy(app, items):
+    start = time.perf_counter()
+    for i, item in enumerate(items):
+        for message, level in ((f"Processing: invoice_{i:05d}.pdf", "info"), ("  Renamed to: X.pdf", "success")):
+            app.log_text.insert(tk.END, message + "\n", level)
+            app.log_text.see(tk.END)
+            app.root.update_idletasks()
+        app.file_tree.item(item, values=("[X]", f"invoice_{i:05d}.pdf", "Done"))
+    app.root.update()
+    return time.perf_counter() - start
+
+
+def run_bridge(app, items):
+    done = threading.Event()
+
+    def worker():
+        for i, item in enumerate(items):
+            app.log(f"Processing: invoice_{i:05d}.pdf", "info")
+            app.log("  Renamed to: X.pdf", "success")
+            app.set_item_status(item, "Done")
+        app.call_in_ui(done.set)
+
+    start = time.perf_counter()
+    threading.Thread(target=worker, daemon=True).start()
+    while not done.is_set():
+        app.root.update()
+        time.sleep(0.001)
+    app.root.update()
+    return time.perf_counter() - start
+
+
+def main():
+    file_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise SystemExit(f"no display available: {e}")
+    app = ModernPDFRenamer(root)
+    app.show_pdf_rename_mode()
+    root.update()
+
+    lines = file_count * LINES_PER_FILE
+    print(f"{file_count} files, {lines} log lines")
+    timings = {}
+    for label, run in (("direct", run_legacy), ("bridge", run_bridge)):
+        items = fill_tree(app, file_count)
+        root.update()
+        timings[label] = run(app, items)
+        shown = int(app.log_text.index("end-1c").split(".")[0]) - 1
+        if shown < lines:
+            raise SystemExit(f"{label}: only {shown} of {lines} log lines shown")
+        print(f"{label:>8}: {timings[label]:7.2f}s  ({lines / timings[label]:.0f} lines/s)")
+
+    print(f"speedup: {timings['direct'] / timings['bridge']:.2f}x")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Synthetic invoice corpus used by the benchmark scripts.
+
+The PDFs are written by hand (plain PDF 1.4 syntax, Helvetica text) so the
+benchmarks do not need any PDF authoring library on top of the tool's own
+dependencies.
+"""
+import os
+import random
+
+CONSIGNEES = [
+    "Shree Balaji Traders",
+    "Om Sai Enterprises",
+    "Mahalaxmi Textiles Pvt Ltd",
+    "Ganesh Agencies",
+    "Krishna Distributors",
+    "Sunrise Polymers",
+    "Vijay Steel Corporation",
+    "Annapurna Food Products",
+    "Royal Hardware Stores",
+    "Patel Brothers & Co.",
+]
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _content_stream(lines):
+    parts = ["BT", "/F1 10 Tf", "12 TL", "40 800 Td"]
+    for line in lines:
+        parts.append(f"({_escape(line)}) Tj T*")
+    parts.append("ET")
+    return "\n".join(parts).encode("latin-1")
+
+
+def invoice_lines(consignee, invoice_no=1, filler=40):
+    lines = [
+        "TAX INVOICE",
+        f"Invoice No. SLCM/{invoice_no:05d}    Dated 01-04-2025",
+        "Seller: SLCM Group, Industrial Area, Phase II",
+        "GSTIN: 24AAACS1234A1Z5",
+        "Consignee (Ship to)",
+        f"{consignee}    Buyer's Order No. PO-{invoice_no:04d}",
+        "Plot 12, Market Yard Road",
+        "State Name : Gujarat, Code : 24",
+    ]
+    for row in range(filler):
+        lines.append(f"{row + 1:>3}  Item {row + 1:03d}  HSN 5407  Qty {row % 9 + 1}  Rate 125.00  Amount {125 * (row % 9 + 1)}.00")
+    return lines
+
+
+def filler_lines(page_no, filler=60):
+    return [f"Annexure page {page_no} line {row + 1}: terms, conditions and item details" for row in range(filler)]
+
+
+def write_pdf(path, pages):
+    """Write ``pages`` (a list of line lists) as a text PDF at ``path``."""
+    page_count = len(pages)
+    font_id = 3
+    first_page_id = 4
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        font_id: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for index, lines in enumerate(pages):
+        page_id = first_page_id + index * 2
+        content_id = page_id + 1
+        kids.append(f"{page_id} 0 R")
+        stream = _content_stream(lines)
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode("latin-1")
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref_offset = len(out)
+    size = max(objects) + 1
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % size
+    for obj_id in range(1, size):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def generate_single_page_corpus(folder, count, seed=7):
+    """Create ``count`` one-invoice PDFs in ``folder`` and return their paths."""
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = os.path.join(folder, f"invoice_{index + 1:05d}.pdf")
+        write_pdf(path, [invoice_lines(rng.choice(CONSIGNEES), index + 1)])
+        paths.append(path)
+    return paths
+
+
+def generate_multi_page_pdf(path, page_count, seed=7):
+    """Create one consolidated PDF with one invoice per page."""
+    rng = random.Random(seed)
+    pages = [invoice_lines(rng.choice(CONSIGNEES), index + 1) for index in range(page_count)]
+    write_pdf(path, pages)
+    return path
@@ -0,0 +1,50 @@
+"""Synthetic ledger exports for the Excel split benchmarks."""
+import datetime
+import random
+
+from corpus import CONSIGNEES
+
+HEADER = ["Voucher No", "Date", "Party Name", "Comm Grouping", "Item", "Qty", "Rate", "Amount", "Narration"]
+COMM_GROUPS = ["Yarn", "Fabric", "Dyes & Chemicals", "Packing", "Freight", "Job Work"]
+
+
+def ledger_rows(row_count, party_count=200, seed=3):
+    rng = random.Random(seed)
+    parties = [f"{rng.choice(CONSIGNEES)} #{index}" for index in range(party_count)]
+    start = datetime.datetime(2025, 4, 1)
+    for index in range(row_count):
+        qty = rng.randint(1, 500)
+        rate = round(rng.uniform(10, 900), 2)
+        yield (
+            f"SLCM/{index + 1:07d}",
+            start + datetime.timedelta(minutes=index),
+            rng.choice(parties),
+            rng.choice(COMM_GROUPS),
+            f"Item {rng.randint(1, 5000):05d}",
+            qty,
+            rate,
+            round(qty * rate, 2),
+            "Monthly ledger export line",
+        )
+
+
+def write_ledger_xlsx(path, row_count, party_count=200):
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(HEADER)
+    for row in ledger_rows(row_count, party_count):
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+def write_ledger_csv(path, row_count, party_count=200):
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(ledger_rows(row_count, party_count))
+    return path
@@ -0,0 +1,267 @@
+"""Command-line batch mode: the desktop app's workflows without Tk.
+
+    python cli.py rename INVOICE_FOLDER [--recursive] [--output-mode auto] [--profile [cprofile]] [--workers N] [--output DIR]
+    python cli.py split CONSOLIDATED.pdf [--sharded] [--workers N] [--output DIR]
+    python cli.py excel-split LEDGER.xlsx [--streaming] [--writer xlsxwriter] [--output DIR]
+    python cli.py watch INVOICE_FOLDER [--settle SECONDS] [--workers N] [--output DIR]
+
+Log lines and a progress line every few seconds go to stderr and a JSON
+summary of the run, including per-stage timings, to stdout (or to the file
+given with --summary); ``watch`` runs until interrupted (Ctrl+C or
+SIGTERM) and then prints its summary. The exit status is 0 when every file was
+processed, 1 when some files failed and 2 when the run could not start or
+was aborted by an error.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+
+from engine import (
+    EXCEL_ENGINES,
+    OUTPUT_MODES,
+    PROFILE_MODES,
+    FolderWatcher,
+    ProcessingError,
+    describe_progress,
+    iter_pdf_records,
+    open_layout_profiles,
+    rename_pdfs,
+    split_excel,
+    split_patterns,
+    split_pdf,
+)
+
+LEVEL_PREFIXES = {"info": "", "success": "", "warning": "WARNING: ", "error": "ERROR: "}
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+
+def make_logger(quiet=False):
+    def log(message, level="info"):
+        if quiet and level in ("info", "success"):
+            return
+        for line in message.strip("\n").split("\n"):
+            if line:
+                print(LEVEL_PREFIXES.get(level, "") + line, file=sys.stderr, flush=True)
+    return log
+
+
+def make_progress(quiet=False, interval=PROGRESS_INTERVAL_SECONDS):
+    """Progress callback printing a line to stderr at most every ``interval`` seconds."""
+    if quiet:
+        return None
+    last_printed = 0.0
+
+    def on_progress(snapshot):
+        nonlocal last_printed
+        now = time.monotonic()
+        if now - last_printed >= interval or snapshot['done'] == snapshot['total']:
+            last_printed = now
+            print("Progress: " + describe_progress(snapshot), file=sys.stderr, flush=True)
+    return on_progress
+
+
+def default_output(path):
+    folder = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    return os.path.join(folder, "output")
+
+
+def run_rename(args, log):
+    if not os.path.isdir(args.source):
+        raise ProcessingError(f"Not a folder: {args.source}")
+    output_folder = args.output or default_output(args.source)
+    records = list(iter_pdf_records(
+        args.source,
+        args.recursive,
+        split_patterns(args.include) or ["*.pdf"],
+        split_patterns(args.exclude),
+        skip_dirs=[output_folder]
+    ))
+    if not records:
+        raise ProcessingError(f"No PDF files found in {args.source}")
+    log(f"Found {len(records)} PDF file(s)", "success")
+    return rename_pdfs(
+        [record.path for record in records],
+        output_folder,
+        args.workers,
+        args.layouts,
+        not args.no_cache,
+        log=log,
+        display_names=[record.name for record in records],
+        resume=args.resume,
+        on_progress=make_progress(args.quiet),
+        profile=args.profile,
+        output_mode=args.output_mode
+    )
+
+
+def run_split(args, log):
+    if not os.path.isfile(args.source):
+        raise ProcessingError(f"Not a file: {args.source}")
+    output_folder = args.output or default_output(args.source)
+    return split_pdf(args.source, output_folder, args.workers, args.sharded, args.layouts, log=log,
+                     on_progress=make_progress(args.quiet), profile=args.profile)
+
+
+def run_excel_split(args, log):
+    if not os.path.isfile(args.source):
+        raise ProcessingError(f"Not a file: {args.source}")
+    output_folder = args.output or default_output(args.source)
+    return split_excel(
+        args.source,
+        output_folder,
+        args.streaming,
+        args.writer,
+        args.workers,
+        not args.no_table_cache,
+        log=log,
+        on_progress=make_progress(args.quiet),
+        profile=args.profile
+    )
+
+
+def run_watch(args, log):
+    if not os.path.isdir(args.source):
+        raise ProcessingError(f"Not a folder: {args.source}")
+
+    layouts = None
+    if args.layouts:
+        profiles = open_layout_profiles(log)
+        layouts = profiles.active_bboxes() if profiles else None
+
+    watcher = FolderWatcher(
+        args.source,
+        args.output,
+        args.workers,
+        args.recursive,
+        split_patterns(args.include) or ["*.pdf"],
+        split_patterns(args.exclude),
+        settle_seconds=args.settle,
+        poll_interval=args.poll,
+        use_watchdog=not args.polling,
+        layouts=layouts,
+        log=log
+    )
+
+    # Ctrl+C and SIGTERM only ask the watcher to stop, so files already
+    # being processed are finished and the summary is still written.
+    stop = threading.Event()
+    handlers = {}
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        handlers[signum] = signal.signal(signum, lambda signum, frame: stop.set())
+    try:
+        return watcher.run(stop)
+    finally:
+        for signum, handler in handlers.items():
+            signal.signal(signum, handler)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Batch-process SLCM invoices and ledger exports without the desktop UI."
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    common.add_argument("--output", default=None,
+                        help="output folder (default: 'output' next to the source)")
+    common.add_argument("--summary", default=None,
+                        help="write the JSON summary to this file instead of stdout")
+    common.add_argument("--quiet", action="store_true",
+                        help="only log warnings and errors")
+
+    profiled = argparse.ArgumentParser(add_help=False)
+    profiled.add_argument("--profile", nargs="?", const="timings", choices=PROFILE_MODES, default=None,
+                          help="write per-file stage timings to the output folder; 'cprofile' also "
+                               "saves a .prof file and runs in a single process")
+
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rename = commands.add_parser("rename", parents=[common, profiled],
+                                 help="rename single-page invoices after their consignee")
+    rename.add_argument("source", help="folder containing the PDFs")
+    rename.add_argument("--recursive", action="store_true", help="include subfolders")
+    rename.add_argument("--include", default="*.pdf", help="';'-separated globs to include")
+    rename.add_argument("--exclude", default="", help="';'-separated globs to exclude")
+    rename.add_argument("--layouts", action="store_true", help="use layout profiles")
+    rename.add_argument("--no-cache", action="store_true", help="ignore the extraction cache")
+    rename.add_argument("--resume", action="store_true",
+                        help="skip files the output folder's manifest shows as done")
+    rename.add_argument("--output-mode", choices=OUTPUT_MODES, default="copy",
+                        help="how renamed files reach the output folder: 'auto' tries a reflink, "
+                             "then a hard link, then a copy; 'move' removes the originals "
+                             "(default: copy)")
+    rename.set_defaults(run=run_rename)
+
+    split = commands.add_parser("split", parents=[common, profiled],
+                                help="split a multi-page invoice PDF into one file per page")
+    split.add_argument("source", help="the multi-page PDF")
+    split.add_argument("--sharded", action="store_true",
+                       help="split page ranges in parallel worker processes")
+    split.add_argument("--layouts", action="store_true", help="use layout profiles")
+    split.set_defaults(run=run_split)
+
+    excel = commands.add_parser("excel-split", parents=[common, profiled],
+                                help="split a ledger export by party name and comm grouping")
+    excel.add_argument("source", help="the .xlsx, .xls or .csv export")
+    excel.add_argument("--streaming", action="store_true",
+                       help="read the sheet row by row instead of loading it whole")
+    excel.add_argument("--writer", choices=EXCEL_ENGINES, default="auto",
+                       help="Excel writer engine (default: auto)")
+    excel.add_argument("--no-table-cache", action="store_true",
+                       help="do not reuse a columnar copy from an earlier run")
+    excel.set_defaults(run=run_excel_split)
+
+    watch = commands.add_parser("watch", parents=[common],
+                                help="rename invoices as they are dropped into a folder")
+    watch.add_argument("source", help="folder to watch")
+    watch.add_argument("--recursive", action="store_true", help="include subfolders")
+    watch.add_argument("--include", default="*.pdf", help="';'-separated globs to include")
+    watch.add_argument("--exclude", default="", help="';'-separated globs to exclude")
+    watch.add_argument("--layouts", action="store_true", help="use layout profiles")
+    watch.add_argument("--settle", type=float, default=2.0,
+                       help="seconds a file must stay unchanged before it is processed (default: 2)")
+    watch.add_argument("--poll", type=float, default=1.0,
+                       help="seconds between folder scans when polling (default: 1)")
+    watch.add_argument("--polling", action="store_true",
+                       help="poll even when watchdog is installed")
+    watch.set_defaults(run=run_watch)
+
+    return parser
+
+
+def write_summary(summary, path=None):
+    text = json.dumps(summary, indent=2, default=str)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    log = make_logger(args.quiet)
+
+    try:
+        summary = args.run(args, log)
+    except Exception as e:
+        # ProcessingError messages are written for the user; anything else
+        # gets its type so the nightly logs show what broke.
+        message = str(e) if isinstance(e, ProcessingError) else f"{type(e).__name__}: {e}"
+        log(message, "error")
+        write_summary({'workflow': args.command, 'error': message}, args.summary)
+        return 2
+
+    write_summary(summary, args.summary)
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
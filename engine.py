@@ -0,0 +1,2430 @@
+"""UI-free processing engine shared by the desktop app and the command line.
+
+The three workflows are :func:`rename_pdfs`, :func:`split_pdf` and
+:func:`split_excel`. Each reports progress through a ``log(message, level)``
+callback (levels: info, success, warning, error) and an optional
+``on_progress(snapshot)`` callback fed by a :class:`ProgressMeter`, raises
+:class:`ProcessingError` for problems with the input and returns a summary
+dict that can be written out as JSON.
+"""
+import os
+import shutil
+import re
+import signal
+import sqlite3
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+import cProfile
+import csv
+import errno
+import fnmatch
+import hashlib
+import importlib.util
+import json
+import itertools
+import multiprocessing
+import pickle
+import queue
+import sys
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from normalize import clean_consignee_name, sanitize_lookup, sanitize_name
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+def is_installed(name):
+    """Whether the top-level module ``name`` can be imported, without importing it."""
+    return name in sys.modules or importlib.util.find_spec(name) is not None
+
+
+def lazy_import(name):
+    """Return module ``name``, loaded on first attribute access, or None if it is not installed."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        return None
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# Together these take over a second to import, so each is only loaded by
+# the first workflow that touches it rather than when the app starts.
+pdfplumber = lazy_import("pdfplumber")
+pypdf = lazy_import("pypdf")
+pd = lazy_import("pandas")
+openpyxl = lazy_import("openpyxl")
+xlsxwriter = lazy_import("xlsxwriter")
+
+
+def preload_for_workers(*modules):
+    """Finish loading lazily imported ``modules`` before a process pool starts.
+
+    Forked workers then inherit them instead of each importing them again.
+    Spawned workers import everything themselves, so this is skipped there.
+    """
+    if multiprocessing.get_start_method() != "fork":
+        return
+    for module in modules:
+        if module is not None:
+            getattr(module, "__file__", None)
+
+
+EXCEL_ENGINES = ("auto", "openpyxl", "xlsxwriter", "pandas")
+OUTPUT_MODES = ("copy", "auto", "reflink", "hardlink", "move")
+# ioctl request that clones a file's extents on Linux (btrfs, XFS, ...).
+FICLONE = 0x40049409
+# Errors meaning the file system or platform cannot link or clone at all,
+# as opposed to a problem with this particular file.
+UNSUPPORTED_ERRNOS = {errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+                      errno.ENOTTY, errno.EPERM, errno.ENOSYS}
+PROFILE_MODES = ("timings", "cprofile")
+XLSXWRITER_IN_MEMORY_ROWS = 5000
+TABLE_CACHE_MAX_BYTES = 2 * 1024 ** 3
+TABLE_CACHE_MAX_AGE_DAYS = 30
+CONSIGNEE_ANCHOR = re.compile(r"Consignee\s*\(Ship\s*to\)", re.IGNORECASE)
+LAYOUT_LEARN_SAMPLES = 5
+MAX_NAME_LENGTH = 80
+EXTRACTOR_TIERS = ("pypdf", "pdfplumber")
+# Bump whenever a change to extraction could produce a different name, so
+# names cached by older versions are ignored.
+EXTRACTOR_VERSION = 2
+
+
+def default_worker_count():
+    return os.cpu_count() or 1
+
+
+def app_data_dir():
+    """Per-user folder for settings and caches shared between runs."""
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'SLCM Processor')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def extract_consignee_name(pdf_path):
+    """Return the consignee name printed in ``pdf_path``, or None.
+
+    Errors opening or parsing the PDF propagate to the caller.
+    """
+    return scan_consignee_name(pdf_path)['name']
+
+
+def add_time(timings, stage, started):
+    """Add the seconds since ``started`` (a ``perf_counter`` value) to ``timings[stage]``."""
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
+
+
+class PageTextStream:
+    """Lazily yield ``extract_text()`` for each page of an open pdfplumber PDF."""
+    
+    def __init__(self, pdf, timings=None):
+        self.pdf = pdf
+        self.timings = timings
+        self.pages_parsed = 0
+    
+    def __iter__(self):
+        for page in self.pdf.pages:
+            self.pages_parsed += 1
+            started = time.perf_counter()
+            try:
+                text = page.extract_text() or ""
+            finally:
+                add_time(self.timings, 'extract', started)
+            try:
+                yield text
+            finally:
+                page.flush_cache()
+
+
+def plausible_name(name):
+    """Whether a name found by the pypdf tier can be trusted without pdfplumber.
+
+    pypdf does no layout analysis, so on some templates the line after the
+    heading is a neighbouring column or a run of codes. Names must be 3 to
+    ``MAX_NAME_LENGTH`` characters with letters making up at least half of
+    the non-space characters.
+    """
+    if not name or not 3 <= len(name) <= MAX_NAME_LENGTH:
+        return False
+    letters = sum(char.isalpha() for char in name)
+    return letters >= 3 and letters * 2 >= len(name) - name.count(' ')
+
+
+def fast_consignee_name(reader_pages, timings=None, tier_pages=None):
+    """The pypdf tier: search pypdf ``extract_text()`` output for the consignee heading.
+
+    ``reader_pages`` are pypdf ``PageObject``s, searched in order. Returns
+    the name, or None when pypdf fails, finds no name or only an implausible
+    one, in which case the caller falls back to pdfplumber. Each page read
+    is counted in ``tier_pages['pypdf']``.
+    """
+    def page_texts():
+        for page in reader_pages:
+            if tier_pages is not None:
+                tier_pages['pypdf'] += 1
+            started = time.perf_counter()
+            try:
+                text = page.extract_text() or ""
+            finally:
+                add_time(timings, 'extract', started)
+            yield text
+    
+    try:
+        name = find_consignee_name(page_texts(), timings)
+    except Exception:
+        return None
+    return name if plausible_name(name) else None
+
+
+def scan_consignee_name(pdf_path, layouts=None, fast=True):
+    """Search ``pdf_path`` page by page, stopping at the first consignee name.
+
+    Text is first taken from pypdf (see :func:`fast_consignee_name`), which
+    is an order of magnitude cheaper than pdfplumber's layout analysis;
+    pdfplumber is only opened when that fails, or always with ``fast=False``,
+    and never when it is not installed.
+    ``layouts`` maps page-size keys (see :func:`page_layout_key`) to a bounding
+    box; when page 1 matches one, pdfplumber analyzes only that region first
+    and the full-page scan is the fallback. Returns a dict with ``name``,
+    ``tier`` (the ``EXTRACTOR_TIERS`` entry that found it, or None),
+    ``pages_parsed`` (pages read by either tier), ``tier_pages`` (the same
+    count per tier; a page pypdf could not use counts for both), ``cropped`` (the name came
+    from the layout region), ``layout`` (a ``(key, bbox)`` sample for
+    learning a profile, or None) and ``timings`` (seconds spent opening the
+    file, extracting text and cleaning candidate names).
+    """
+    timings = {}
+    tier_pages = dict.fromkeys(EXTRACTOR_TIERS, 0)
+    result = {'name': None, 'tier': None, 'pages_parsed': 0, 'tier_pages': tier_pages, 'cropped': False,
+              'layout': None, 'timings': timings}
+    
+    if fast:
+        started = time.perf_counter()
+        try:
+            reader_pages = pypdf.PdfReader(pdf_path).pages
+        except Exception:
+            reader_pages = []
+        add_time(timings, 'open', started)
+        result['name'] = fast_consignee_name(reader_pages, timings, tier_pages)
+        result['pages_parsed'] = tier_pages['pypdf']
+        if result['name']:
+            result['tier'] = "pypdf"
+            return result
+    
+    if pdfplumber is None:
+        return result
+    
+    started = time.perf_counter()
+    with pdfplumber.open(pdf_path) as pdf:
+        pages = pdf.pages
+        add_time(timings, 'open', started)
+        
+        key = None
+        if layouts is not None and pages:
+            first_page = pages[0]
+            key = page_layout_key(first_page)
+            bbox = layouts.get(key)
+            if bbox:
+                tier_pages['pdfplumber'] += 1
+                result['pages_parsed'] += 1
+                started = time.perf_counter()
+                text = cropped_text(first_page, bbox)
+                add_time(timings, 'extract', started)
+                result['name'] = consignee_name_from_text(text, timings)
+                if result['name']:
+                    result['tier'] = "pdfplumber"
+                    result['cropped'] = True
+                    return result
+        
+        page_texts = PageTextStream(pdf, timings)
+        result['name'] = find_consignee_name(page_texts, timings)
+        tier_pages['pdfplumber'] += page_texts.pages_parsed
+        result['pages_parsed'] += page_texts.pages_parsed
+        if result['name']:
+            result['tier'] = "pdfplumber"
+        
+        if key is not None and result['name'] and page_texts.pages_parsed == 1 and key not in layouts:
+            band = consignee_band(pdf.pages[0])
+            if band:
+                result['layout'] = (key, band)
+    
+    return result
+
+
+def page_layout_key(page):
+    return f"{round(page.width)}x{round(page.height)}"
+
+
+def cropped_text(page, bbox):
+    x0, top, x1, bottom = bbox
+    x0, top = max(x0, page.bbox[0]), max(top, page.bbox[1])
+    x1, bottom = min(x1, page.bbox[2]), min(bottom, page.bbox[3])
+    if x1 <= x0 or bottom <= top:
+        return ""
+    return page.crop((x0, top, x1, bottom)).extract_text() or ""
+
+
+def consignee_band(page):
+    """Return a full-width ``(x0, top, x1, bottom)`` band around the consignee block on ``page``."""
+    matches = page.search(CONSIGNEE_ANCHOR.pattern, regex=True, case=False)
+    if not matches:
+        return None
+    anchor = matches[0]
+    line_height = anchor['bottom'] - anchor['top']
+    return (
+        page.bbox[0],
+        max(page.bbox[1], anchor['top'] - line_height),
+        page.bbox[2],
+        min(page.bbox[3], anchor['bottom'] + line_height * 7),
+    )
+
+
+class LayoutProfiles:
+    """Bounding boxes of the consignee block per invoice template.
+
+    Templates are identified by page size. A profile is learned by taking the
+    union of the consignee bands of the first ``learn_samples`` files of that
+    size, or defined by hand in the JSON file with ``"locked": true``::
+
+        {"595x842": {"bbox": [0, 60, 595, 160], "samples": 0, "locked": true}}
+    """
+    
+    def __init__(self, path=None, learn_samples=LAYOUT_LEARN_SAMPLES):
+        self.path = path or os.path.join(app_data_dir(), "layout_profiles.json")
+        self.learn_samples = learn_samples
+        self.profiles = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.profiles = json.load(f)
+    
+    def active_bboxes(self):
+        return {
+            key: tuple(profile['bbox'])
+            for key, profile in self.profiles.items()
+            if profile.get('locked') or profile.get('samples', 0) >= self.learn_samples
+        }
+    
+    def learn(self, key, bbox):
+        """Merge a sample into the profile for ``key``; True once the profile becomes active."""
+        profile = self.profiles.setdefault(key, {'bbox': list(bbox), 'samples': 0})
+        if profile.get('locked') or profile['samples'] >= self.learn_samples:
+            return False
+        x0, top, x1, bottom = profile['bbox']
+        profile['bbox'] = [min(x0, bbox[0]), min(top, bbox[1]), max(x1, bbox[2]), max(bottom, bbox[3])]
+        profile['samples'] += 1
+        return profile['samples'] >= self.learn_samples
+    
+    def save(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(self.profiles, f, indent=2)
+
+
+def find_consignee_name(page_texts, timings=None):
+    """Find the name under the ``Consignee (Ship to)`` heading in a stream of page texts.
+
+    Each page is searched as soon as it arrives and the stream is abandoned
+    once a name is found. The four lines following the heading are tried in
+    order, carrying over to the next page when the heading is at the bottom
+    of a page. Time spent cleaning candidates is added to
+    ``timings['clean']``.
+    """
+    remaining = 0
+    for text in page_texts:
+        for line in text.split('\n'):
+            if remaining:
+                remaining -= 1
+                candidate = line.strip()
+                if candidate:
+                    started = time.perf_counter()
+                    name = clean_consignee_name(candidate)
+                    add_time(timings, 'clean', started)
+                    if name:
+                        return name
+            if CONSIGNEE_ANCHOR.search(line):
+                remaining = 4
+    return None
+
+
+def consignee_name_from_text(text, timings=None):
+    """Find the name printed under the ``Consignee (Ship to)`` heading in ``text``."""
+    return find_consignee_name([text], timings)
+
+
+def page_consignee_name(page, layouts=None, timings=None):
+    """Consignee name on a single pdfplumber page, trying its layout region first."""
+    if layouts:
+        bbox = layouts.get(page_layout_key(page))
+        if bbox:
+            started = time.perf_counter()
+            text = cropped_text(page, bbox)
+            add_time(timings, 'extract', started)
+            name = consignee_name_from_text(text, timings)
+            if name:
+                return name
+    started = time.perf_counter()
+    text = page.extract_text() or ""
+    add_time(timings, 'extract', started)
+    return consignee_name_from_text(text, timings)
+
+
+def tier_counts():
+    """Counter of how many names each extractor tier found (``none``: no tier did)."""
+    return dict.fromkeys((*EXTRACTOR_TIERS, "none"), 0)
+
+
+def describe_tiers(tiers):
+    return ", ".join(f"{tier} {count}" for tier, count in tiers.items())
+
+
+def tiered_page_name(reader_page, page, layouts=None, timings=None):
+    """Consignee name on one page: pypdf ``reader_page`` first, then pdfplumber ``page``.
+
+    Returns ``(name, tier)``; pdfplumber errors propagate. ``page`` is None
+    when pdfplumber is not installed, leaving only the pypdf tier.
+    """
+    name = fast_consignee_name([reader_page], timings)
+    if name:
+        return name, "pypdf"
+    if page is None:
+        return None, None
+    name = page_consignee_name(page, layouts, timings)
+    return name, ("pdfplumber" if name else None)
+
+
+def file_sha1(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """On-disk cache of extracted consignee names.
+
+    Files are recognised by path, size and modification time; when those do
+    not match but the file could still be a known one (a touched file, or a
+    copy or move that kept the size and modification time) the content hash
+    is used instead, so an unchanged file is never parsed twice. Files that
+    cannot be known are not hashed by :meth:`lookup`: their hash is computed
+    alongside the extraction and handed to :meth:`store`. Entries record the
+    extractor version and the least recently used ones are evicted once the
+    cache holds more than ``max_entries`` names. Failed extractions are
+    cached too (as a NULL name).
+
+    Writes are collected in memory and applied by :meth:`flush` in one
+    short transaction, every ``FLUSH_EVERY`` names and when the cache is
+    closed, so no write lock is held between files and another instance
+    (the app and a scheduled ``cli.py`` run) can use the cache meanwhile.
+    """
+    
+    FLUSH_EVERY = 200
+    
+    def __init__(self, path=None, max_entries=100000):
+        self.path = path or os.path.join(app_data_dir(), "extraction_cache.sqlite3")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.pending_files = {}
+        self.pending_names = {}
+        self.pending_used = {}
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, hash TEXT
+            );
+            CREATE TABLE IF NOT EXISTS names (
+                hash TEXT PRIMARY KEY, name TEXT, version INTEGER, last_used REAL
+            );
+            CREATE INDEX IF NOT EXISTS names_last_used ON names (last_used);
+            CREATE INDEX IF NOT EXISTS files_stat ON files (size, mtime_ns);
+        """)
+    
+    def lookup(self, path):
+        """Return ``(found, name, content_hash)`` for ``path``.
+        
+        ``content_hash`` is None when the file was not hashed because no
+        cached file matches its path or its size and modification time.
+        """
+        st = os.stat(path)
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, hash FROM files WHERE path = ?", (path,)
+        ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            content_hash = row[2]
+        elif row or self.conn.execute(
+            "SELECT 1 FROM files WHERE size = ? AND mtime_ns = ? LIMIT 1", (st.st_size, st.st_mtime_ns)
+        ).fetchone():
+            content_hash = file_sha1(path)
+            self.remember(path, st.st_size, st.st_mtime_ns, content_hash)
+        else:
+            self.misses += 1
+            return False, None, None
+        
+        entry = self.conn.execute(
+            "SELECT name FROM names WHERE hash = ? AND version = ?", (content_hash, EXTRACTOR_VERSION)
+        ).fetchone()
+        if entry is None:
+            self.misses += 1
+            return False, None, content_hash
+        
+        self.pending_used[content_hash] = time.time()
+        self.hits += 1
+        return True, entry[0], content_hash
+    
+    def remember(self, path, size, mtime_ns, content_hash):
+        self.pending_files[path] = (path, size, mtime_ns, content_hash)
+    
+    def store(self, content_hash, name):
+        self.pending_names[content_hash] = (content_hash, name, EXTRACTOR_VERSION, time.time())
+        if len(self.pending_names) >= self.FLUSH_EVERY:
+            self.flush()
+    
+    def flush(self):
+        """Write the pending files, names and last-used times in one transaction."""
+        if not (self.pending_files or self.pending_names or self.pending_used):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, hash) VALUES (?, ?, ?, ?)",
+                self.pending_files.values()
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO names (hash, name, version, last_used) VALUES (?, ?, ?, ?)",
+                self.pending_names.values()
+            )
+            self.conn.executemany(
+                "UPDATE names SET last_used = ? WHERE hash = ?",
+                [(last_used, content_hash) for content_hash, last_used in self.pending_used.items()]
+            )
+        self.pending_files.clear()
+        self.pending_names.clear()
+        self.pending_used.clear()
+    
+    def evict(self):
+        self.flush()
+        with self.conn:
+            excess = self.conn.execute("SELECT COUNT(*) FROM names").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM names WHERE hash IN (SELECT hash FROM names ORDER BY last_used LIMIT ?)",
+                    (excess,)
+                )
+            self.conn.execute("DELETE FROM files WHERE hash NOT IN (SELECT hash FROM names)")
+        return max(excess, 0)
+    
+    def clear(self):
+        self.pending_files.clear()
+        self.pending_names.clear()
+        self.pending_used.clear()
+        with self.conn:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("DELETE FROM names")
+        self.conn.execute("VACUUM")
+    
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.conn.close()
+
+
+def open_plumber(pdf_path, pages=None):
+    """``pdfplumber.open(pdf_path)``, or a context yielding None when pdfplumber is not installed."""
+    if pdfplumber is None:
+        return nullcontext()
+    return pdfplumber.open(pdf_path, pages=pages)
+
+
+def write_single_page(reader, page_index, output_path):
+    writer = pypdf.PdfWriter()
+    writer.add_page(reader.pages[page_index])
+    with open(output_path, 'wb') as output_file:
+        writer.write(output_file)
+
+
+def iter_split_pages(pdf_path, output_folder, layouts=None, on_start=None):
+    """Split ``pdf_path`` into one PDF per page named after its consignee.
+
+    The source is opened once: pdfplumber reads each page's text in place and
+    pypdf writes the page a single time, straight to its final name (or
+    ``Page_N.pdf`` when no consignee is found). Yields one result dict per
+    page with ``page``, ``total``, ``name``, ``tier``, ``output``,
+    ``read_error``, ``write_error`` and ``timings`` keys; the time taken to
+    open the source is counted on the first page. Names come from
+    :func:`tiered_page_name`, so pdfplumber only analyzes pages where
+    pypdf's text has no plausible name; without pdfplumber installed only
+    pypdf's text is searched. ``on_start(total_pages)`` is called before the
+    first page is processed.
+    """
+    timings = {}
+    started = time.perf_counter()
+    reader = pypdf.PdfReader(pdf_path)
+    name_counts = defaultdict(int)
+    
+    with open_plumber(pdf_path) as pdf:
+        total_pages = len(reader.pages)
+        add_time(timings, 'open', started)
+        if on_start:
+            on_start(total_pages)
+        for page_index in range(total_pages):
+            result = {'page': page_index, 'total': total_pages, 'name': None, 'tier': None,
+                      'output': None, 'read_error': None, 'write_error': None,
+                      'timings': timings}
+            
+            page = pdf.pages[page_index] if pdf else None
+            try:
+                result['name'], result['tier'] = tiered_page_name(reader.pages[page_index], page, layouts, timings)
+            except Exception as e:
+                result['read_error'] = str(e)
+            finally:
+                if page is not None:
+                    page.flush_cache()
+            
+            if result['name']:
+                result['output'] = next_output_name(name_counts, result['name'])
+            else:
+                result['output'] = f"Page_{page_index + 1}.pdf"
+            
+            started = time.perf_counter()
+            try:
+                write_single_page(reader, page_index, os.path.join(output_folder, result['output']))
+            except Exception as e:
+                result['write_error'] = str(e)
+            add_time(timings, 'write', started)
+            
+            yield result
+            timings = {}
+
+
+def next_output_name(name_counts, consignee_name):
+    """Reserve the next ``name.pdf`` / ``name - N.pdf`` file name for a consignee."""
+    name_counts[consignee_name] += 1
+    count = name_counts[consignee_name]
+    
+    if count > 1:
+        return f"{consignee_name} - {count}.pdf"
+    return f"{consignee_name}.pdf"
+
+
+def parse_output_name(output_name):
+    """Inverse of :func:`next_output_name`: ``"Name - 3.pdf"`` -> ``("Name", 3)``, ``"Name.pdf"`` -> ``("Name", 1)``."""
+    stem = os.path.splitext(output_name)[0]
+    match = re.fullmatch(r'(.+) - (\d+)', stem)
+    if match:
+        return match.group(1), int(match.group(2))
+    return stem, 1
+
+
+class RunManifest:
+    """Append-only JSONL log of a rename run, kept next to its output.
+
+    Every run starts with a ``{"run": ...}`` line and then gets one line per
+    file with its source path, size, mtime, content hash (when the
+    extraction cache computed one), extracted name, output file, status and
+    error. Each line is flushed as it is written, so the manifest is
+    complete up to the last file handled even if the run is killed.
+    """
+    
+    FILE_NAME = "rename_manifest.jsonl"
+    
+    def __init__(self, output_folder):
+        self.path = os.path.join(output_folder, self.FILE_NAME)
+        self.file = None
+    
+    def load(self):
+        """Entries of the latest batch, i.e. since the last run that was not a resume.
+        
+        Returns ``(entries, name_counts)``: the newest entry per source path
+        and the duplicate counters as they stood after those entries. A
+        truncated last line (from a crash mid-write) is ignored.
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries, defaultdict(int)
+        
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'run' in record:
+                    if not record.get('resume'):
+                        entries = {}
+                    continue
+                entries[record['source']] = record
+        
+        name_counts = defaultdict(int)
+        for entry in entries.values():
+            if entry.get('output'):
+                name, count = parse_output_name(entry['output'])
+                name_counts[name] = max(name_counts[name], count)
+        return entries, name_counts
+    
+    def start(self, total, resume=False):
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if self.file.tell() and not self.ends_with_newline():
+            # Terminate a line cut short by a crash so it stays on its own.
+            self.file.write("\n")
+        self.write({'run': time.strftime('%Y-%m-%dT%H:%M:%S'), 'total': total, 'resume': resume})
+    
+    def ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+    
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+    
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+
+def _extract_job(pdf_path, layouts=None, hash_file=False):
+    # Runs inside a worker process: exceptions are returned as text so a bad
+    # file never tears down the pool. With ``hash_file`` the content hash
+    # for the extraction cache is computed here too, as ``hash``.
+    try:
+        result = scan_consignee_name(pdf_path, layouts)
+        if hash_file:
+            started = time.perf_counter()
+            result['hash'] = file_sha1(pdf_path)
+            add_time(result['timings'], 'hash', started)
+        result['error'] = None
+    except Exception as e:
+        result = failed_extraction(str(e))
+    return result
+
+
+def failed_extraction(error):
+    """An :func:`_extract_job` result for a file whose extraction failed with ``error``."""
+    return {'name': None, 'tier': None, 'pages_parsed': 0, 'tier_pages': {}, 'cropped': False,
+            'layout': None, 'timings': {}, 'error': error}
+
+
+def _extract_page_range(pdf_path, start, stop, layouts=None):
+    # Worker-side: each process opens its own pypdf and pdfplumber handles
+    # for its chunk. Returns (name, tier, error, timings) per page; opening
+    # counts on the first.
+    results = []
+    timings = {}
+    started = time.perf_counter()
+    reader = pypdf.PdfReader(pdf_path)
+    with open_plumber(pdf_path, pages=range(start + 1, stop + 1)) as pdf:
+        pages = pdf.pages if pdf else [None] * (stop - start)
+        add_time(timings, 'open', started)
+        for page_index, page in zip(range(start, stop), pages):
+            try:
+                name, tier = tiered_page_name(reader.pages[page_index], page, layouts, timings)
+                results.append((name, tier, None, timings))
+            except Exception as e:
+                results.append((None, None, str(e), timings))
+            finally:
+                if page is not None:
+                    page.flush_cache()
+            timings = {}
+    return results
+
+
+def _write_page_range(pdf_path, output_folder, outputs):
+    # Worker-side: ``outputs`` is a list of (page_index, output_name) pairs.
+    # Returns (error, timings) per page.
+    timings = {}
+    started = time.perf_counter()
+    reader = pypdf.PdfReader(pdf_path)
+    add_time(timings, 'open', started)
+    results = []
+    for page_index, output_name in outputs:
+        started = time.perf_counter()
+        try:
+            write_single_page(reader, page_index, os.path.join(output_folder, output_name))
+            error = None
+        except Exception as e:
+            error = str(e)
+        add_time(timings, 'write', started)
+        results.append((error, timings))
+        timings = {}
+    return results
+
+
+def page_chunks(total_pages, workers, max_chunk=200):
+    """Split ``range(total_pages)`` into ``(start, stop)`` chunks for ``workers`` processes."""
+    chunk_size = max(1, min(max_chunk, -(-total_pages // (workers * 4))))
+    return [(start, min(start + chunk_size, total_pages)) for start in range(0, total_pages, chunk_size)]
+
+
+def iter_split_pages_sharded(pdf_path, output_folder, workers=None, layouts=None, on_start=None):
+    """Parallel variant of :func:`iter_split_pages` for very large PDFs.
+
+    The page range is cut into chunks that go through a process pool in two
+    steps, each worker opening its own handles: the chunk's consignee names
+    are extracted, then, once every earlier chunk's names are known, they
+    are numbered in page order exactly as the serial split does and the
+    chunk writes its pages. Only about ``workers`` chunks are queued at a
+    time, so early chunks are written while later ones are still being
+    read, and pages are yielded from the first chunk on rather than after
+    the whole document has been read. Yields the same result dicts as
+    :func:`iter_split_pages`, in page order; ``on_start(total_pages)`` is
+    called before any page is processed.
+    """
+    workers = workers or default_worker_count()
+    total_pages = len(pypdf.PdfReader(pdf_path).pages)
+    if on_start:
+        on_start(total_pages)
+    chunks = page_chunks(total_pages, workers)
+    
+    preload_for_workers(pdfplumber)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        to_extract = iter(enumerate(chunks))
+        extracting = {}
+        writing = {}
+        extracted = {}
+        written = {}
+        entries = {}
+        name_counts = defaultdict(int)
+        next_to_number = 0
+        next_to_yield = 0
+        
+        while next_to_yield < len(chunks):
+            while len(extracting) + len(writing) < workers:
+                job = next(to_extract, None)
+                if job is None:
+                    break
+                index, (start, stop) = job
+                extracting[executor.submit(_extract_page_range, pdf_path, start, stop, layouts)] = index
+            
+            done, _ = wait([*extracting, *writing], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in extracting:
+                    extracted[extracting.pop(future)] = future.result()
+                else:
+                    written[writing.pop(future)] = future.result()
+            
+            while next_to_number in extracted:
+                start, stop = chunks[next_to_number]
+                chunk_entries = []
+                for page_index, (name, tier, read_error, timings) in zip(range(start, stop),
+                                                                          extracted.pop(next_to_number)):
+                    if name:
+                        output_name = next_output_name(name_counts, name)
+                    else:
+                        output_name = f"Page_{page_index + 1}.pdf"
+                    chunk_entries.append({'page': page_index, 'total': total_pages, 'name': name, 'tier': tier,
+                                          'output': output_name, 'read_error': read_error, 'write_error': None,
+                                          'timings': timings})
+                entries[next_to_number] = chunk_entries
+                outputs = [(entry['page'], entry['output']) for entry in chunk_entries]
+                writing[executor.submit(_write_page_range, pdf_path, output_folder, outputs)] = next_to_number
+                next_to_number += 1
+            
+            while next_to_yield in written:
+                for entry, (write_error, timings) in zip(entries.pop(next_to_yield), written.pop(next_to_yield)):
+                    entry['write_error'] = write_error
+                    for stage, seconds in timings.items():
+                        entry['timings'][stage] = entry['timings'].get(stage, 0.0) + seconds
+                    yield entry
+                next_to_yield += 1
+
+
+def iter_consignee_names(pdf_paths, workers=None, layouts=None, hash_files=()):
+    """Extract consignee names for ``pdf_paths`` using a process pool.
+
+    Yields ``(index, result)`` pairs in completion order, where ``index`` is
+    the position of the file in ``pdf_paths`` and ``result`` is the dict from
+    :func:`scan_consignee_name` plus an ``error`` key, and a ``hash`` key
+    (see :func:`file_sha1`) for the positions in ``hash_files``. With a single worker
+    the files are processed inline, in order, without starting a pool.
+
+    Files are submitted a few at a time rather than all at once, so changes
+    the caller makes to ``layouts`` while consuming results (for example a
+    newly learned profile) apply to the files that are still queued.
+    """
+    workers = max(1, min(workers or default_worker_count(), len(pdf_paths) or 1))
+    
+    if workers == 1:
+        for index, pdf_path in enumerate(pdf_paths):
+            yield index, _extract_job(pdf_path, layouts, index in hash_files)
+        return
+    
+    preload_for_workers(pypdf, pdfplumber)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = ((index, (pdf_path, layouts, index in hash_files)) for index, pdf_path in enumerate(pdf_paths))
+        yield from iter_pool_results(executor, _extract_job, jobs, workers * 4)
+
+
+def iter_pool_results(executor, func, jobs, max_in_flight):
+    """Run ``func(*args)`` for each ``(tag, args)`` in ``jobs`` on ``executor``.
+
+    At most ``max_in_flight`` calls are pending at once and ``jobs`` is only
+    advanced as calls finish, so a lazy ``jobs`` generator bounds how much
+    work (and memory) is queued. Yields ``(tag, result)`` in completion order.
+    """
+    jobs = iter(jobs)
+    in_flight = {}
+    while True:
+        for tag, args in jobs:
+            in_flight[executor.submit(func, *args)] = tag
+            if len(in_flight) >= max_in_flight:
+                break
+        if not in_flight:
+            break
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield in_flight.pop(future), future.result()
+
+
+def iter_in_order(results):
+    """Re-sequence ``(index, ...)`` tuples arriving in any order.
+
+    Each result is released as soon as every lower index has been released,
+    so callers can assign duplicate-name counters deterministically while
+    still consuming a completion-ordered stream.
+    """
+    pending = {}
+    next_index = 0
+    for result in results:
+        pending[result[0]] = result
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def read_table(path):
+    if path.lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def load_table_cached(path, cache_dir=None):
+    """Read a ledger export, reusing a columnar copy from an earlier run.
+
+    The copy lives in ``cache_dir`` (by default ``table_cache`` in the app
+    data folder) and is keyed by the source path, size and mtime, so editing
+    or replacing the source invalidates it. Parquet is used when pyarrow is
+    installed, pickle otherwise. The cache is best effort: when its folder
+    cannot be used or the copy cannot be saved (disk full, no permission)
+    the table read from the source is returned all the same. After each
+    save the folder is trimmed with :func:`evict_table_cache`. Returns
+    ``(df, from_cache)``.
+    """
+    try:
+        cache_dir = cache_dir or os.path.join(app_data_dir(), "table_cache")
+        os.makedirs(cache_dir, exist_ok=True)
+        st = os.stat(path)
+    except OSError:
+        return read_table(path), False
+    
+    prefix = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+    stem = os.path.join(cache_dir, f"{prefix}-{st.st_size}-{st.st_mtime_ns}")
+    
+    for ext, reader in ((".parquet", pd.read_parquet), (".pkl", pd.read_pickle)):
+        if os.path.exists(stem + ext):
+            try:
+                df = reader(stem + ext)
+            except Exception:
+                remove_quietly(stem + ext)
+                continue
+            # The modification time doubles as the last-used time for eviction.
+            try:
+                os.utime(stem + ext)
+            except OSError:
+                pass
+            return df, True
+    
+    df = read_table(path)
+    
+    try:
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix + "-"):
+                os.remove(os.path.join(cache_dir, name))
+        try:
+            df.to_parquet(stem + ".parquet", index=False)
+            saved = stem + ".parquet"
+        except Exception:
+            # pyarrow missing, or a column it cannot store (e.g. mixed types).
+            remove_quietly(stem + ".parquet")
+            df.to_pickle(stem + ".pkl")
+            saved = stem + ".pkl"
+        evict_table_cache(cache_dir, keep=saved)
+    except Exception:
+        remove_quietly(stem + ".parquet")
+        remove_quietly(stem + ".pkl")
+    
+    return df, False
+
+
+def remove_quietly(path):
+    """Delete ``path`` if it exists, ignoring errors."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def close_quietly(resource):
+    """Call ``resource.close()``, ignoring errors."""
+    try:
+        resource.close()
+    except Exception:
+        pass
+
+
+def evict_table_cache(cache_dir, max_bytes=TABLE_CACHE_MAX_BYTES, max_age_days=TABLE_CACHE_MAX_AGE_DAYS,
+                      keep=None):
+    """Trim the table cache in ``cache_dir``.
+
+    Copies unused for ``max_age_days`` are deleted, then the least recently
+    used ones until the folder holds at most ``max_bytes``. ``keep`` (a
+    path) is never deleted. Returns the number of files removed.
+    """
+    entries = []
+    for name in os.listdir(cache_dir):
+        entry_path = os.path.join(cache_dir, name)
+        try:
+            st = os.stat(entry_path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, entry_path))
+    entries.sort()
+    
+    cutoff = time.time() - max_age_days * 86400
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for mtime, size, entry_path in entries:
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        if entry_path == keep:
+            continue
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
+
+
+def clear_table_cache(cache_dir=None):
+    """Delete every cached table copy. Returns the number of files removed."""
+    cache_dir = cache_dir or os.path.join(app_data_dir(), "table_cache")
+    if not os.path.isdir(cache_dir):
+        return 0
+    return evict_table_cache(cache_dir, max_bytes=0, max_age_days=0)
+
+
+def find_split_columns(columns):
+    """Return the ``(party_col, comm_col)`` headers used to split a ledger export."""
+    party_col = None
+    comm_col = None
+    
+    for col in columns:
+        col_lower = str(col).lower().strip()
+        if 'party' in col_lower and 'name' in col_lower:
+            party_col = col
+        if 'comm' in col_lower and 'group' in col_lower:
+            comm_col = col
+    
+    return party_col, comm_col
+
+
+class SheetRowReader:
+    """Stream the rows of a ledger export without loading it into a DataFrame.
+
+    ``.xlsx`` files are read with openpyxl in read-only mode and ``.csv``
+    files in pandas chunks. ``header`` holds the column names and iterating
+    yields one tuple of cell values per row, with blanks as None and fully
+    empty rows skipped.
+    """
+    
+    def __init__(self, path, chunk_rows=20000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.workbook = None
+        
+        if path.lower().endswith('.csv'):
+            self.chunks = pd.read_csv(path, chunksize=chunk_rows)
+            self.first_chunk = next(self.chunks, None)
+            columns = self.first_chunk.columns if self.first_chunk is not None else pd.read_csv(path, nrows=0).columns
+            self.header = list(columns)
+        else:
+            self.workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+            self.rows = self.workbook.active.iter_rows(values_only=True)
+            first_row = next(self.rows, ())
+            self.header = [
+                f"Unnamed: {index}" if value is None else value
+                for index, value in enumerate(first_row)
+            ]
+    
+    def __iter__(self):
+        width = len(self.header)
+        if self.workbook is None:
+            chunks = [self.first_chunk] if self.first_chunk is not None else []
+            for chunk in itertools.chain(chunks, self.chunks):
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                yield from chunk.itertuples(index=False, name=None)
+        else:
+            for row in self.rows:
+                if any(value is not None for value in row):
+                    yield tuple(row[:width]) + (None,) * (width - len(row))
+    
+    def close(self):
+        if self.workbook is not None:
+            self.workbook.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class GroupSpool:
+    """Collect rows per (party, comm) group with a bounded memory footprint.
+
+    Rows are buffered in memory until ``max_buffered_rows`` is reached, then
+    every buffer is appended (pickled) to its group's spill file in
+    ``spill_dir``. :meth:`rows` replays a group's spilled rows followed by
+    its in-memory rows, in their original order.
+    """
+    
+    def __init__(self, spill_dir, max_buffered_rows=50000):
+        self.spill_dir = spill_dir
+        self.max_buffered_rows = max_buffered_rows
+        self.buffers = defaultdict(list)
+        self.spill_files = {}
+        self.row_counts = {}
+        self.buffered = 0
+    
+    def add(self, key, row):
+        self.buffers[key].append(row)
+        self.row_counts[key] = self.row_counts.get(key, 0) + 1
+        self.buffered += 1
+        if self.buffered >= self.max_buffered_rows:
+            self.spill()
+    
+    def spill(self):
+        for key, rows in self.buffers.items():
+            path = self.spill_files.get(key)
+            if path is None:
+                path = os.path.join(self.spill_dir, f"group_{len(self.spill_files)}.pkl")
+                self.spill_files[key] = path
+            with open(path, 'ab') as f:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffers.clear()
+        self.buffered = 0
+    
+    def keys(self):
+        try:
+            return sorted(self.row_counts)
+        except TypeError:
+            return list(self.row_counts)
+    
+    def rows(self, key):
+        path = self.spill_files.get(key)
+        if path is not None:
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        yield from pickle.load(f)
+                    except EOFError:
+                        break
+        yield from self.buffers.get(key, ())
+    
+    def discard(self, key):
+        self.buffers.pop(key, None)
+        path = self.spill_files.pop(key, None)
+        if path is not None:
+            os.remove(path)
+
+
+def spool_groups(rows, party_index, comm_index, spool):
+    """Route ``rows`` into ``spool`` by (party, comm); rows missing either are skipped.
+
+    Returns ``(total_rows, skipped_rows)``.
+    """
+    total = 0
+    skipped = 0
+    for row in rows:
+        total += 1
+        party = row[party_index]
+        comm = row[comm_index]
+        if party is None or comm is None:
+            skipped += 1
+            continue
+        spool.add((party, comm), row)
+    return total, skipped
+
+
+def resolve_excel_engine(engine):
+    """Map an ``EXCEL_ENGINES`` choice to the writer that will actually be used."""
+    if engine == "auto":
+        return "xlsxwriter" if xlsxwriter is not None else "openpyxl"
+    if engine == "xlsxwriter" and xlsxwriter is None:
+        return "openpyxl"
+    return engine
+
+
+def excel_cells(df):
+    """Return ``df`` as a 2-D object array of plain Python values with blanks as None.
+
+    Converting the whole frame once lets each group be sliced out with a
+    single ``take`` instead of paying pandas overhead per group.
+    """
+    return df.astype(object).where(df.notna(), None).to_numpy()
+
+
+def write_rows_xlsx(output_path, header, rows, engine="openpyxl", row_count=None):
+    """Write ``header`` and ``rows`` to a new single-sheet workbook, row by row.
+
+    ``openpyxl`` uses a write-only workbook. ``xlsxwriter`` uses
+    ``constant_memory`` mode, or builds small sheets (``row_count`` known and
+    below ``XLSXWRITER_IN_MEMORY_ROWS``) in memory to skip its temporary
+    files. Returns the number of data rows written.
+    """
+    count = 0
+    if engine == "xlsxwriter":
+        small = row_count is not None and row_count < XLSXWRITER_IN_MEMORY_ROWS
+        workbook = xlsxwriter.Workbook(output_path, {
+            'in_memory' if small else 'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+            'nan_inf_to_errors': True,
+            'remove_timezone': True,
+        })
+        sheet = workbook.add_worksheet()
+        sheet.write_row(0, 0, header)
+        for count, row in enumerate(rows, 1):
+            sheet.write_row(count, 0, row)
+        workbook.close()
+        return count
+    
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(header)
+    for row in rows:
+        sheet.append(row)
+        count += 1
+    workbook.save(output_path)
+    return count
+
+
+def group_filename(name_counts, party_name, comm_name):
+    """Reserve the ``party_comm.xlsx`` file name for a group, numbering repeats.
+
+    Different groups can sanitize to the same name ("A&B" and "AB"); the
+    second becomes ``party_comm_2.xlsx`` and so on, so parallel writers never
+    share a path. Counted case-insensitively, as Windows file names are.
+    """
+    stem = f"{party_name}_{comm_name}"
+    name_counts[stem.lower()] += 1
+    count = name_counts[stem.lower()]
+    return f"{stem}.xlsx" if count == 1 else f"{stem}_{count}.xlsx"
+
+
+def _write_group_job(output_path, header, data, engine):
+    # Worker-side: ``data`` is the group DataFrame for the pandas engine and
+    # a list of row lists otherwise. Returns (rows, error, seconds); errors
+    # come back as text.
+    started = time.perf_counter()
+    try:
+        if engine == "pandas":
+            data.to_excel(output_path, index=False, engine='openpyxl')
+            return len(data), None, time.perf_counter() - started
+        rows = write_rows_xlsx(output_path, header, data, engine, len(data))
+        return rows, None, time.perf_counter() - started
+    except Exception as e:
+        return 0, str(e), time.perf_counter() - started
+
+
+def iter_group_writes(jobs, workers=None, max_in_flight=None):
+    """Write split groups, in parallel when ``workers`` > 1.
+
+    ``jobs`` yields ``(tag, (output_path, header, data, engine))``; it is
+    consumed lazily with at most ``max_in_flight`` groups (default twice
+    the worker count) materialized and queued at a time. Yields
+    ``(tag, (rows_written, error, seconds))`` as each file completes.
+    """
+    workers = max(1, workers or default_worker_count())
+    
+    if workers == 1:
+        for tag, args in jobs:
+            yield tag, _write_group_job(*args)
+        return
+    
+    preload_for_workers(openpyxl, xlsxwriter)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from iter_pool_results(executor, _write_group_job, jobs, max_in_flight or workers * 2)
+
+
+class FileRecord:
+    """A scanned PDF: where it is, what it was when scanned, and how it went."""
+    
+    __slots__ = ('path', 'name', 'size', 'mtime', 'status')
+    
+    def __init__(self, path, name, size, mtime, status="Ready"):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.status = status
+
+
+def split_patterns(text):
+    """``"*.pdf; inv*"`` -> ``["*.pdf", "inv*"]``; commas work as separators too."""
+    return [part.strip() for part in re.split(r'[;,]', text or '') if part.strip()]
+
+
+def matches_any(name, patterns):
+    name = name.lower()
+    return any(fnmatch.fnmatchcase(name, pattern.lower()) for pattern in patterns)
+
+
+def iter_pdf_records(folder, recursive=False, include=("*.pdf",), exclude=(), skip_dirs=()):
+    """Yield a FileRecord for every file under ``folder`` matching the globs.
+    
+    Globs are matched case-insensitively against the path relative to
+    ``folder`` (with forward slashes) and against the bare file name.
+    Size and mtime come from the ``DirEntry`` stat cache, so on Windows
+    no extra system call is made per file. Directories in ``skip_dirs``
+    and unreadable subfolders are skipped; symlinked folders are not
+    followed.
+    """
+    include = list(include) or ["*.pdf"]
+    exclude = list(exclude)
+    skip_dirs = {os.path.normcase(os.path.abspath(path)) for path in skip_dirs}
+    pending = [(folder, "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name.lower())
+        except OSError:
+            if directory == folder:
+                raise
+            continue
+        
+        subfolders = []
+        for entry in entries:
+            relative = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and os.path.normcase(os.path.abspath(entry.path)) not in skip_dirs:
+                        subfolders.append((entry.path, relative + "/"))
+                    continue
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            
+            if not (matches_any(relative, include) or matches_any(entry.name, include)):
+                continue
+            if exclude and (matches_any(relative, exclude) or matches_any(entry.name, exclude)):
+                continue
+            
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            yield FileRecord(entry.path, relative, stat.st_size, stat.st_mtime_ns)
+        
+        pending.extend(reversed(subfolders))
+
+
+class ProcessingError(Exception):
+    """The input cannot be processed; the message is meant for the user."""
+
+
+def _ignore(message, level="info"):
+    pass
+
+
+def format_duration(seconds):
+    """``75`` -> ``"1m 15s"``, ``4000`` -> ``"1h 06m"``."""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
+
+class ProgressMeter:
+    """Progress of a batch: items done out of ``total``, rate, ETA and stage timings.
+    
+    The rate is a moving average over the last ``window`` items, so the ETA
+    follows the current speed rather than the whole run's. Items skipped
+    without doing any work (resumed files) advance the count but not the
+    rate. ``stages`` accumulates seconds per stage (open, extract, clean,
+    copy/write, ...); timings measured inside worker processes are summed,
+    so with several workers the stages can add up to more than the elapsed
+    time. ``on_update(snapshot)`` is called after every :meth:`advance`.
+    """
+    
+    def __init__(self, total=0, unit="files", on_update=None, window=50, profile=None):
+        self.total = total
+        self.unit = unit
+        self.on_update = on_update
+        self.profile = profile
+        self.done = 0
+        self.worked = 0
+        self.started = time.perf_counter()
+        self.samples = deque([(self.started, 0)], maxlen=window + 1)
+        self.stages = defaultdict(float)
+    
+    def add_timings(self, timings):
+        for stage, seconds in (timings or {}).items():
+            self.stages[stage] += seconds
+    
+    def record(self, item, timings, output=None, status=None):
+        """Add one item's stage timings, also listing them in the run profile if there is one."""
+        self.add_timings(timings)
+        if self.profile:
+            self.profile.record(item, timings, output, status)
+    
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - started
+    
+    def start(self, total):
+        """Set ``total`` once it is known and report it before any item is done."""
+        self.total = total
+        if self.on_update:
+            self.on_update(self.snapshot())
+    
+    def advance(self, count=1, skipped=False):
+        self.done += count
+        if not skipped:
+            self.worked += count
+            self.samples.append((time.perf_counter(), self.worked))
+        if self.on_update:
+            self.on_update(self.snapshot())
+    
+    def rate(self):
+        """Items per second over the moving window."""
+        first_time, first_count = self.samples[0]
+        last_time, last_count = self.samples[-1]
+        if last_time <= first_time:
+            return 0.0
+        return (last_count - first_count) / (last_time - first_time)
+    
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        rate = self.rate()
+        remaining = max(0, self.total - self.done)
+        if not remaining:
+            eta = 0.0
+        elif rate:
+            eta = round(remaining / rate, 1)
+        else:
+            eta = None
+        return {
+            'done': self.done,
+            'total': self.total,
+            'unit': self.unit,
+            'elapsed': round(elapsed, 3),
+            'rate': round(rate, 2),
+            'eta': eta,
+            'stages': {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+        }
+    
+    def summary(self):
+        """The ``stages`` and ``per_second`` entries of a workflow summary."""
+        elapsed = time.perf_counter() - self.started
+        return {
+            'stages': {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+            'per_second': round(self.worked / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+
+def describe_progress(snapshot):
+    """One-line progress text, e.g. ``"120/2000 files (6%) | 14.2 files/s | ETA 2m 12s"``."""
+    done, total, unit = snapshot['done'], snapshot['total'], snapshot['unit']
+    text = f"{done}/{total} {unit}"
+    if total:
+        text += f" ({done * 100 // total}%)"
+    if snapshot['rate']:
+        text += f" | {snapshot['rate']:.1f} {unit}/s"
+    if snapshot['eta'] is not None and done < total:
+        text += f" | ETA {format_duration(snapshot['eta'])}"
+    return text
+
+
+def describe_stages(stages):
+    """``{'open': 1.2, 'extract': 10.5}`` -> ``"open 1.20s, extract 10.50s"``."""
+    return ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items())
+
+
+def log_stages(meter, log):
+    if meter.stages:
+        log(f"Stage time: {describe_stages(meter.snapshot()['stages'])}", "info")
+
+
+class RunProfile:
+    """Opt-in profiling of a workflow run, written next to its output.
+    
+    Every item's stage timings (see :class:`ProgressMeter`) become a row of
+    ``profile_<workflow>.csv``, followed by an ``(all)`` row with the run's
+    totals. In ``cprofile`` mode the run is also executed under
+    :mod:`cProfile` and the statistics are saved to ``profile_<workflow>.prof``
+    (open with ``python -m pstats`` or snakeviz). cProfile only sees the
+    calling thread, so the workflows run with a single worker process in
+    that mode.
+    """
+    
+    def __init__(self, output_folder, workflow, mode="timings"):
+        if mode not in PROFILE_MODES:
+            raise ProcessingError(f"Unknown profile mode: {mode}")
+        self.csv_path = os.path.join(output_folder, f"profile_{workflow}.csv")
+        self.prof_path = os.path.join(output_folder, f"profile_{workflow}.prof") if mode == "cprofile" else None
+        self.profiler = cProfile.Profile() if mode == "cprofile" else None
+        self.rows = []
+        self.stages = []
+    
+    def record(self, item, timings, output=None, status=None):
+        timings = timings or {}
+        for stage in timings:
+            if stage not in self.stages:
+                self.stages.append(stage)
+        row = {'item': item, 'output': output, 'status': status, 'total': round(sum(timings.values()), 6)}
+        row.update((stage, round(seconds, 6)) for stage, seconds in timings.items())
+        self.rows.append(row)
+    
+    @contextmanager
+    def active(self):
+        """Run the block under the cProfile profiler, if this profile has one."""
+        if self.profiler is None:
+            yield
+            return
+        self.profiler.enable()
+        try:
+            yield
+        finally:
+            self.profiler.disable()
+    
+    def save(self, stages):
+        """Write the CSV (and the ``.prof`` file); ``stages`` are the run's totals."""
+        columns = list(stages) + [stage for stage in self.stages if stage not in stages]
+        with open(self.csv_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, ['item', 'output', 'status', *columns, 'total'])
+            writer.writeheader()
+            writer.writerows(self.rows)
+            writer.writerow({'item': '(all)', 'total': round(sum(stages.values()), 6),
+                             **{stage: round(seconds, 6) for stage, seconds in stages.items()}})
+        if self.profiler:
+            self.profiler.dump_stats(self.prof_path)
+    
+    def paths(self):
+        return {'timings': self.csv_path, 'cprofile': self.prof_path}
+
+
+def open_run_profile(profile, output_folder, workflow, log=_ignore):
+    """A :class:`RunProfile` for ``profile`` (one of ``PROFILE_MODES``), or None when it is off."""
+    if not profile:
+        return None
+    run_profile = RunProfile(output_folder, workflow, profile)
+    if run_profile.profiler:
+        log("Profiling with cProfile: running in a single process", "info")
+    else:
+        log("Profiling: recording per-file stage timings", "info")
+    return run_profile
+
+
+def save_run_profile(run_profile, meter, log=_ignore):
+    if not run_profile:
+        return None
+    try:
+        run_profile.save(dict(meter.stages))
+    except OSError as e:
+        log(f"Could not write profile: {str(e)}", "warning")
+        return None
+    log(f"Profile written to {os.path.basename(run_profile.csv_path)}"
+        + (f" and {os.path.basename(run_profile.prof_path)}" if run_profile.prof_path else ""), "info")
+    return run_profile.paths()
+
+
+@contextmanager
+def profiling(run_profile):
+    """``run_profile.active()``, or nothing when profiling is off."""
+    if run_profile is None:
+        yield
+    else:
+        with run_profile.active():
+            yield
+
+
+def open_layout_profiles(log=_ignore):
+    try:
+        return LayoutProfiles()
+    except Exception as e:
+        log(f"Could not load layout profiles: {str(e)}", "warning")
+        return None
+
+
+def open_extraction_cache(log=_ignore):
+    try:
+        return ExtractionCache()
+    except Exception as e:
+        log(f"Extraction cache unavailable: {str(e)}", "warning")
+        return None
+
+
+def prepare_output_folder(output_folder, log=_ignore):
+    try:
+        os.makedirs(output_folder, exist_ok=True)
+    except OSError as e:
+        raise ProcessingError(f"Failed to create output folder: {str(e)}") from e
+    log(f"Output folder: {output_folder}", "info")
+
+
+def reflink_file(source, destination):
+    """Clone ``source`` to the new file ``destination``, sharing its data blocks (Linux ``FICLONE``)."""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    with open(source, 'rb') as src, open(destination, 'xb') as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            error = None
+        except OSError as e:
+            error = e
+    if error:
+        os.unlink(destination)
+        raise error
+    shutil.copystat(source, destination)
+
+
+class OutputPlacer:
+    """Puts a renamed file into the output folder according to an ``OUTPUT_MODES`` entry.
+    
+    ``copy`` duplicates the file (``shutil.copy2``). ``reflink`` and
+    ``hardlink`` share the source's data instead and fall back to a copy
+    when the file system cannot; ``auto`` tries a reflink, then a hard
+    link, then a copy. ``move`` renames the source into place, which
+    removes it from the input folder. A method that fails as unsupported
+    is not retried for the same pair of devices. :meth:`place` returns the
+    method actually used and ``counts`` tallies them.
+    """
+    
+    METHODS = ("reflink", "hardlink", "move", "copy")
+    
+    def __init__(self, mode="copy"):
+        if mode not in OUTPUT_MODES:
+            raise ProcessingError(f"Unknown output mode: {mode}")
+        self.mode = mode
+        self.unsupported = set()
+        self.counts = dict.fromkeys(self.METHODS, 0)
+    
+    def methods(self):
+        if self.mode == "auto":
+            return ("reflink", "hardlink", "copy")
+        if self.mode in ("reflink", "hardlink"):
+            return (self.mode, "copy")
+        return (self.mode,)
+    
+    def place(self, source, destination):
+        # Replace, never write into, an existing output: it may be a hard
+        # link to another invoice from an earlier run.
+        if os.path.lexists(destination):
+            if os.path.realpath(source) == os.path.realpath(destination):
+                raise shutil.SameFileError(f"{source} and {destination} are the same file")
+            os.unlink(destination)
+        
+        devices = None
+        for method in self.methods():
+            if method in ("reflink", "hardlink"):
+                if devices is None:
+                    devices = (os.stat(source).st_dev, os.stat(os.path.dirname(destination) or ".").st_dev)
+                if (method, devices) in self.unsupported:
+                    continue
+                try:
+                    if method == "reflink":
+                        reflink_file(source, destination)
+                    else:
+                        os.link(source, destination)
+                except OSError as e:
+                    if e.errno in UNSUPPORTED_ERRNOS:
+                        self.unsupported.add((method, devices))
+                    continue
+            elif method == "move":
+                shutil.move(source, destination)
+            else:
+                shutil.copy2(source, destination)
+            self.counts[method] += 1
+            return method
+
+
+def rename_pdfs(pdf_paths, output_folder, workers=None, use_layouts=False, use_cache=False,
+                log=_ignore, on_status=None, display_names=None, resume=False, on_progress=None,
+                profile=None, output_mode="copy"):
+    """Copy each single-page invoice in ``pdf_paths`` to ``output_folder`` under its consignee name.
+
+    ``on_status(index, status)`` is called once per file, in input order,
+    with ``"Done"``, ``"Failed"`` (no consignee found) or ``"Error"`` (the
+    copy failed). ``display_names`` replaces the base names in log lines.
+
+    Every file is recorded in the output folder's :class:`RunManifest`.
+    With ``resume``, files the manifest shows as done (or as having no
+    consignee) and that have not changed since are skipped, and numbering
+    continues from the manifest's counters.
+    
+    ``output_mode`` is one of ``OUTPUT_MODES`` (see :class:`OutputPlacer`);
+    the method used for each file is logged and recorded.
+    
+    ``on_progress`` receives a :class:`ProgressMeter` snapshot after every
+    file; the summary carries the per-stage timings (open, extract, clean,
+    copy) and the files-per-second rate. ``profile`` (one of
+    ``PROFILE_MODES``) saves them per file as a :class:`RunProfile`.
+    """
+    started = time.perf_counter()
+    display_names = display_names or [os.path.basename(path) for path in pdf_paths]
+    prepare_output_folder(output_folder, log)
+    
+    placer = OutputPlacer(output_mode)
+    run_profile = open_run_profile(profile, output_folder, "rename", log)
+    if run_profile and run_profile.profiler:
+        workers = 1
+    meter = ProgressMeter(len(pdf_paths), "files", on_progress, profile=run_profile)
+    
+    manifest = RunManifest(output_folder)
+    previous, name_counts = manifest.load() if resume else ({}, defaultdict(int))
+    if resume and not previous:
+        log("Nothing to resume in this output folder; processing every file", "warning")
+    
+    success_count = 0
+    pages_parsed = 0
+    tier_pages = dict.fromkeys(EXTRACTOR_TIERS, 0)
+    cropped_count = 0
+    tiers = tier_counts()
+    files = []
+    
+    profiles = open_layout_profiles(log) if use_layouts else None
+    layouts = profiles.active_bboxes() if profiles else None
+    
+    log("\n" + "="*50, "info")
+    log(f"Starting rename process with {workers or default_worker_count()} worker(s)...", "info")
+    log("="*50 + "\n", "info")
+    
+    if pdfplumber is None:
+        log("pdfplumber is not installed: names are only searched in pypdf's text", "warning")
+    
+    stats = {}
+    resumed = {}
+    for index, pdf_path in enumerate(pdf_paths):
+        try:
+            st = os.stat(pdf_path)
+            stats[index] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            continue
+        entry = previous.get(pdf_path)
+        if (entry and (entry['size'], entry['mtime_ns']) == stats[index]
+                and (entry['status'] == "Done" or (entry['status'] == "Failed" and not entry['error']))):
+            resumed[index] = entry
+    if resumed:
+        log(f"Resuming: {len(resumed)} file(s) already handled by the interrupted run", "info")
+    
+    cache = open_extraction_cache(log) if use_cache else None
+    # Keeps the hit and miss counts if the cache is dropped mid-run.
+    cache_used = cache
+    cached = {}
+    content_hashes = {}
+    lookup_timings = {}
+    to_extract = []
+    with profiling(run_profile):
+        for index, pdf_path in enumerate(pdf_paths):
+            if index in resumed:
+                continue
+            if cache:
+                lookup_timings[index] = {}
+                lookup_started = time.perf_counter()
+                try:
+                    found, name, content_hashes[index] = cache.lookup(pdf_path)
+                    if found:
+                        cached[index] = {'name': name, 'pages_parsed': 0, 'cropped': False,
+                                         'layout': None, 'error': None, 'cached': True}
+                        continue
+                except Exception as e:
+                    log(f"Cache lookup failed for {display_names[index]}: {str(e)}", "warning")
+                finally:
+                    add_time(lookup_timings[index], 'hash', lookup_started)
+            to_extract.append(index)
+    
+    def results():
+        for index, entry in resumed.items():
+            yield index, {'resumed': entry}
+        yield from cached.items()
+        # Files the cache could not know are hashed by the workers, next to
+        # the extraction, rather than one by one up front.
+        hash_files = {position for position, index in enumerate(to_extract)
+                      if cache and content_hashes.get(index) is None and index in stats}
+        extracted = iter_consignee_names([pdf_paths[index] for index in to_extract], workers, layouts,
+                                         hash_files)
+        for position, result in extracted:
+            yield to_extract[position], result
+    
+    manifest.start(len(pdf_paths), resume)
+    
+    try:
+        # Names are extracted in parallel and arrive in completion order;
+        # iter_in_order hands them back in input order so the "name - N.pdf"
+        # numbering matches a serial run.
+        with profiling(run_profile):
+            for index, result in iter_in_order(results()):
+                pdf_path = pdf_paths[index]
+                
+                if 'resumed' in result:
+                    entry = result['resumed']
+                    success_count += entry['status'] == "Done"
+                    files.append({'source': pdf_path, 'output': entry['output'], 'status': entry['status'],
+                                  'error': entry['error'], 'resumed': True})
+                    if on_status:
+                        on_status(index, entry['status'])
+                    meter.advance(skipped=True)
+                    continue
+                
+                consignee_name = result['name']
+                timings = lookup_timings.get(index, {})
+                for stage, seconds in (result.get('timings') or {}).items():
+                    timings[stage] = timings.get(stage, 0.0) + seconds
+                pages_parsed += result['pages_parsed']
+                for tier, count in result.get('tier_pages', {}).items():
+                    tier_pages[tier] += count
+                cropped_count += result['cropped']
+                if not result.get('cached'):
+                    tiers[result['tier'] or "none"] += 1
+                
+                if result.get('hash'):
+                    content_hashes[index] = result['hash']
+                if cache and not result.get('cached'):
+                    try:
+                        if result.get('hash'):
+                            cache.remember(pdf_path, *stats[index], result['hash'])
+                        if content_hashes.get(index) and not result['error']:
+                            cache.store(content_hashes[index], consignee_name)
+                    except Exception as e:
+                        # The cache is only an optimisation: stop using it
+                        # rather than abort the rename.
+                        log(f"Extraction cache disabled for the rest of this run: {str(e)}", "warning")
+                        close_quietly(cache)
+                        cache = None
+                
+                if profiles and result['layout']:
+                    key, bbox = result['layout']
+                    if profiles.learn(key, bbox):
+                        layouts[key] = tuple(profiles.profiles[key]['bbox'])
+                        log(f"Learned layout profile for {key} pages", "info")
+                
+                log(f"Processing: {display_names[index]}", "info")
+                
+                if result['error']:
+                    log(f"Error reading PDF: {result['error']}", "error")
+                
+                new_name = None
+                method = None
+                if not consignee_name:
+                    log(f"  Could not find consignee name", "warning")
+                    status = "Failed"
+                else:
+                    new_name = next_output_name(name_counts, consignee_name)
+                    copy_started = time.perf_counter()
+                    try:
+                        method = placer.place(pdf_path, os.path.join(output_folder, new_name))
+                        log(f"  Renamed to: {new_name} ({method})", "success")
+                        status = "Done"
+                        success_count += 1
+                    except Exception as e:
+                        log(f"  Error: {str(e)}", "error")
+                        status = "Error"
+                    add_time(timings, 'copy', copy_started)
+                
+                size, mtime_ns = stats.get(index, (None, None))
+                manifest.write({'source': pdf_path, 'size': size, 'mtime_ns': mtime_ns,
+                                'hash': content_hashes.get(index), 'name': consignee_name,
+                                'output': new_name, 'method': method, 'status': status,
+                                'error': result['error']})
+                files.append({'source': pdf_path, 'output': new_name, 'method': method, 'status': status,
+                              'error': result['error']})
+                if on_status:
+                    on_status(index, status)
+                meter.record(display_names[index], timings, new_name, status)
+                meter.advance()
+    except BaseException:
+        if cache:
+            close_quietly(cache)
+        raise
+    finally:
+        manifest.close()
+    
+    log("\n" + "="*50, "info")
+    log(f"Complete! Successfully renamed {success_count} file(s)", "success")
+    log(f"Pages parsed: {pages_parsed} ({describe_tiers(tier_pages)})", "info")
+    log(f"Extractor tiers: {describe_tiers(tiers)}", "info")
+    log(f"Output ({output_mode}): {describe_tiers(placer.counts)}", "info")
+    log_stages(meter, log)
+    profile_paths = save_run_profile(run_profile, meter, log)
+    if cache_used:
+        log(f"Extraction cache: {cache_used.hits} hit(s), {cache_used.misses} miss(es)", "info")
+    if cache:
+        try:
+            evicted = cache.evict()
+            if evicted:
+                log(f"Extraction cache: evicted {evicted} old entries", "info")
+            cache.close()
+        except Exception as e:
+            log(f"Could not update extraction cache: {str(e)}", "warning")
+    if profiles:
+        log(f"Read from layout region: {cropped_count} file(s)", "info")
+        try:
+            profiles.save()
+        except Exception as e:
+            log(f"Could not save layout profiles: {str(e)}", "warning")
+    log("="*50 + "\n", "info")
+    
+    return {
+        'workflow': 'rename',
+        'output': output_folder,
+        'total': len(pdf_paths),
+        'succeeded': success_count,
+        'failed': len(pdf_paths) - success_count,
+        'resumed': len(resumed),
+        'pages_parsed': pages_parsed,
+        'tier_pages': tier_pages,
+        'tiers': tiers,
+        'output_mode': output_mode,
+        'output_methods': placer.counts,
+        'cache_hits': cache_used.hits if cache_used else None,
+        'cache_misses': cache_used.misses if cache_used else None,
+        'layout_cropped': cropped_count if profiles else None,
+        'seconds': round(time.perf_counter() - started, 3),
+        **meter.summary(),
+        'profile': profile_paths,
+        'manifest': manifest.path,
+        'files': files,
+    }
+
+
+def split_pdf(pdf_path, output_folder, workers=None, sharded=False, use_layouts=False, log=_ignore,
+              on_progress=None, profile=None):
+    """Split a consolidated invoice PDF into one file per page named after its consignee.
+    
+    ``on_progress`` receives a :class:`ProgressMeter` snapshot after every
+    page; ``profile`` saves per-page timings as a :class:`RunProfile`.
+    """
+    started = time.perf_counter()
+    prepare_output_folder(output_folder, log)
+    
+    run_profile = open_run_profile(profile, output_folder, "split", log)
+    if run_profile and run_profile.profiler:
+        sharded = False
+    meter = ProgressMeter(0, "pages", on_progress, profile=run_profile)
+    
+    log("\n" + "="*50, "info")
+    log("Starting PDF split & rename process...", "info")
+    log(f"Source: {os.path.basename(pdf_path)}", "info")
+    log("="*50 + "\n", "info")
+    
+    layouts = None
+    if use_layouts:
+        profiles = open_layout_profiles(log)
+        if profiles:
+            layouts = profiles.active_bboxes()
+            log(f"Layout profiles: {len(layouts)} active", "info")
+    
+    if pdfplumber is None:
+        log("pdfplumber is not installed: names are only searched in pypdf's text", "warning")
+    
+    success_count = 0
+    total_pages = 0
+    tiers = tier_counts()
+    pages = []
+    
+    if sharded:
+        log(f"Sharded mode: {workers or default_worker_count()} worker(s)", "info")
+        results = iter_split_pages_sharded(pdf_path, output_folder, workers, layouts, on_start=meter.start)
+    else:
+        results = iter_split_pages(pdf_path, output_folder, layouts, on_start=meter.start)
+    
+    with profiling(run_profile):
+        for result in results:
+            total_pages = meter.total = result['total']
+            timings = result.pop('timings', None)
+            if result['page'] == 0:
+                log(f"Total pages: {total_pages}", "info")
+            
+            log(f"\nProcessing page {result['page'] + 1}/{total_pages}...", "info")
+            
+            if result['read_error']:
+                log(f"Error reading PDF: {result['read_error']}", "error")
+            
+            if result['write_error']:
+                log(f"  Error writing {result['output']}: {result['write_error']}", "error")
+                status = "Error"
+            elif result['name']:
+                log(f"  Saved as: {result['output']}", "success")
+                success_count += 1
+                status = "Done"
+            else:
+                log(f"  No consignee found, saved as: {result['output']}", "warning")
+                status = "Failed"
+            tiers[result['tier'] or "none"] += 1
+            pages.append(result)
+            meter.record(f"Page {result['page'] + 1}", timings, result['output'], status)
+            meter.advance()
+    
+    log("\n" + "="*50, "info")
+    log(f"Complete! Successfully processed {success_count}/{total_pages} page(s)", "success")
+    log(f"Extractor tiers: {describe_tiers(tiers)}", "info")
+    log_stages(meter, log)
+    profile_paths = save_run_profile(run_profile, meter, log)
+    log("="*50 + "\n", "info")
+    
+    return {
+        'workflow': 'split',
+        'source': pdf_path,
+        'output': output_folder,
+        'total': total_pages,
+        'succeeded': success_count,
+        'failed': total_pages - success_count,
+        'tiers': tiers,
+        'seconds': round(time.perf_counter() - started, 3),
+        **meter.summary(),
+        'profile': profile_paths,
+        'pages': pages,
+    }
+
+
+def split_excel(excel_path, output_folder, streaming=False, excel_engine="auto", workers=None,
+                use_cache=False, log=_ignore, on_progress=None, profile=None):
+    """Write one workbook per (party, comm) group of a ledger export.
+
+    ``streaming`` reads ``.xlsx``/``.csv`` input row by row instead of
+    loading a DataFrame; ``excel_engine`` is one of ``EXCEL_ENGINES``.
+    ``on_progress`` receives a :class:`ProgressMeter` snapshot after every
+    file written; the stages are read, clean, group and write. ``profile``
+    saves per-file write times as a :class:`RunProfile`.
+    """
+    started = time.perf_counter()
+    prepare_output_folder(output_folder, log)
+    
+    run_profile = open_run_profile(profile, output_folder, "excel_split", log)
+    if run_profile and run_profile.profiler:
+        workers = 1
+    meter = ProgressMeter(0, "files", on_progress, profile=run_profile)
+    
+    log("\n" + "="*50, "info")
+    log("Starting Excel split & rename process...", "info")
+    log(f"Source: {os.path.basename(excel_path)}", "info")
+    log("="*50 + "\n", "info")
+    
+    excel_engine = resolve_excel_engine(excel_engine)
+    log(f"Writer engine: {excel_engine}", "info")
+    
+    with profiling(run_profile):
+        if streaming:
+            files = _split_excel_streaming(excel_path, output_folder, excel_engine, workers, use_cache, log, meter)
+        else:
+            files = _split_excel_dataframe(excel_path, output_folder, excel_engine, workers, use_cache, log, meter)
+    success_count = sum(1 for entry in files if not entry['error'])
+    
+    log("\n" + "="*50, "info")
+    log(f"Complete! Created {success_count} Excel file(s)", "success")
+    log_stages(meter, log)
+    profile_paths = save_run_profile(run_profile, meter, log)
+    log("="*50 + "\n", "info")
+    
+    return {
+        'workflow': 'excel-split',
+        'source': excel_path,
+        'output': output_folder,
+        'engine': excel_engine,
+        'total': len(files),
+        'succeeded': success_count,
+        'failed': len(files) - success_count,
+        'seconds': round(time.perf_counter() - started, 3),
+        **meter.summary(),
+        'profile': profile_paths,
+        'files': files,
+    }
+
+
+def check_split_columns(party_col, comm_col, log=_ignore):
+    if not party_col:
+        raise ProcessingError("Could not find 'Party Name' column in the Excel file")
+    if not comm_col:
+        raise ProcessingError("Could not find 'Comm grouping' column in the Excel file")
+    log(f"Using columns: '{party_col}' and '{comm_col}'", "success")
+
+
+def _split_excel_dataframe(excel_path, output_folder, excel_engine, workers, use_cache, log, meter):
+    started = time.perf_counter()
+    with meter.stage('read'):
+        if use_cache:
+            df, from_cache = load_table_cached(excel_path)
+        else:
+            df, from_cache = read_table(excel_path), False
+    
+    source = "cache" if from_cache else os.path.splitext(excel_path)[1].lstrip('.').lower()
+    log(f"Loaded from {source} in {time.perf_counter() - started:.2f}s", "info")
+    
+    log(f"Total rows: {len(df)}", "info")
+    log(f"Columns: {', '.join(map(str, df.columns))}", "info")
+    
+    party_col, comm_col = find_split_columns(df.columns)
+    check_split_columns(party_col, comm_col, log)
+    
+    # Clean every distinct party/comm value once, up front, instead
+    # of per group inside the write loop.
+    with meter.stage('clean'):
+        party_names = sanitize_lookup(df[party_col])
+        comm_names = sanitize_lookup(df[comm_col])
+    
+    with meter.stage('group'):
+        grouped = df.groupby([party_col, comm_col])
+        group_positions = grouped.indices
+        header = list(df.columns)
+        cells = excel_cells(df) if excel_engine != "pandas" else None
+    meter.total = len(group_positions)
+    
+    name_counts = defaultdict(int)
+    
+    def jobs():
+        for (party, comm), positions in group_positions.items():
+            with meter.stage('group'):
+                filename = group_filename(name_counts, party_names[party], comm_names[comm])
+                data = df.iloc[positions] if excel_engine == "pandas" else cells[positions].tolist()
+            yield filename, (os.path.join(output_folder, filename), header, data, excel_engine)
+    
+    return _write_split_groups(jobs(), workers, log, meter)
+
+
+def _split_excel_streaming(excel_path, output_folder, excel_engine, workers, use_cache, log, meter):
+    if excel_path.lower().endswith('.xls'):
+        log("Streaming mode needs .xlsx or .csv input; loading the whole workbook instead", "warning")
+        return _split_excel_dataframe(excel_path, output_folder, excel_engine, workers, use_cache, log, meter)
+    
+    log("Streaming mode: rows are routed to groups as they are read", "info")
+    if excel_engine == "pandas":
+        excel_engine = resolve_excel_engine("auto")
+    
+    with SheetRowReader(excel_path) as reader, tempfile.TemporaryDirectory(prefix="slcm-split-") as spill_dir:
+        header = reader.header
+        log(f"Columns: {', '.join(map(str, header))}", "info")
+        
+        party_col, comm_col = find_split_columns(header)
+        check_split_columns(party_col, comm_col, log)
+        
+        # Rows are read and routed to their group in a single pass, so
+        # the two are timed together as reading.
+        spool = GroupSpool(spill_dir)
+        with meter.stage('read'):
+            total_rows, skipped_rows = spool_groups(
+                reader, header.index(party_col), header.index(comm_col), spool
+            )
+        log(f"Total rows: {total_rows}", "info")
+        if skipped_rows:
+            log(f"Skipped {skipped_rows} row(s) without party or comm value", "warning")
+        
+        party_names = {}
+        comm_names = {}
+        name_counts = defaultdict(int)
+        
+        group_keys = spool.keys()
+        meter.total = len(group_keys)
+        
+        def jobs():
+            for party, comm in group_keys:
+                with meter.stage('clean'):
+                    if party not in party_names:
+                        party_names[party] = sanitize_name(party)
+                    if comm not in comm_names:
+                        comm_names[comm] = sanitize_name(comm)
+                
+                filename = group_filename(name_counts, party_names[party], comm_names[comm])
+                with meter.stage('group'):
+                    rows = list(spool.rows((party, comm)))
+                    spool.discard((party, comm))
+                yield filename, (os.path.join(output_folder, filename), header, rows, excel_engine)
+        
+        return _write_split_groups(jobs(), workers, log, meter)
+
+
+def _write_split_groups(jobs, workers, log, meter):
+    if workers and workers > 1:
+        log(f"Writing with {workers} worker(s)", "info")
+    
+    files = []
+    for filename, (row_count, error, seconds) in iter_group_writes(jobs, workers):
+        if error:
+            log(f"Error creating {filename}: {error}", "error")
+        else:
+            log(f"Created: {filename} ({row_count} rows)", "success")
+        files.append({'output': filename, 'rows': row_count, 'error': error})
+        meter.record(filename, {'write': seconds}, status="Error" if error else "Done")
+        meter.advance()
+    
+    return files
+
+
+def name_counts_from_folder(output_folder):
+    """Rebuild ``next_output_name`` counters from the files already in ``output_folder``.
+
+    Later copies are numbered after the existing ones instead of
+    overwriting them.
+    """
+    name_counts = defaultdict(int)
+    if not os.path.isdir(output_folder):
+        return name_counts
+    for file_name in os.listdir(output_folder):
+        if file_name.lower().endswith('.pdf'):
+            name, count = parse_output_name(file_name)
+            name_counts[name] = max(name_counts[name], count)
+    return name_counts
+
+
+def _ignore_interrupts():
+    # Pool initializer: Ctrl+C reaches the whole process group, but only the
+    # parent should react to it.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+class _WatchdogEvents:
+    # Runs on the watchdog observer thread; only hands paths over. The
+    # observer just calls ``dispatch``, so this does not need to subclass
+    # FileSystemEventHandler and watchdog is only imported once a watch starts.
+    
+    def __init__(self, paths):
+        self.paths = paths
+    
+    def dispatch(self, event):
+        if event.is_directory:
+            return
+        if event.event_type in ("created", "modified"):
+            self.paths.put(event.src_path)
+        elif event.event_type == "moved":
+            self.paths.put(event.dest_path)
+
+
+class FolderWatcher:
+    """Rename invoices as they are dropped into ``folder``, until stopped.
+
+    Changes are picked up from watchdog (inotify, ReadDirectoryChangesW, ...)
+    when it is installed and ``use_watchdog`` is set, otherwise by diffing a
+    stat snapshot of the folder every ``poll_interval`` seconds. A file is
+    processed once its size and mtime have not changed for
+    ``settle_seconds``, so copies still in progress are left alone. Files
+    already in the folder when watching starts are ignored.
+
+    Names are extracted on a process pool that lives for the whole session
+    and each file is copied to ``output_folder`` as in :func:`rename_pdfs`,
+    numbered after the files already there. ``on_result(result)`` receives a
+    dict with ``source``, ``output``, ``status``, ``error`` and ``latency``
+    (seconds from the file settling to its copy being written). If a worker
+    process dies (out of memory, a crash in a C library), the files being
+    extracted at the time are reported as errors and a new pool is started.
+    """
+    
+    def __init__(self, folder, output_folder=None, workers=None, recursive=False,
+                 include=("*.pdf",), exclude=(), settle_seconds=2.0, poll_interval=1.0,
+                 use_watchdog=True, layouts=None, log=_ignore, on_result=None):
+        self.folder = folder
+        self.output_folder = output_folder or os.path.join(folder, "output")
+        self.workers = max(1, workers or default_worker_count())
+        self.recursive = recursive
+        self.include = list(include) or ["*.pdf"]
+        self.exclude = list(exclude)
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self.use_watchdog = use_watchdog and is_installed("watchdog")
+        self.layouts = layouts
+        self.log = log
+        self.on_result = on_result
+        
+        self.pending = {}
+        self.processed = {}
+        self.in_flight = {}
+        self.name_counts = defaultdict(int)
+        self.counts = {'Done': 0, 'Failed': 0, 'Error': 0}
+    
+    def snapshot(self):
+        records = iter_pdf_records(self.folder, self.recursive, self.include, self.exclude,
+                                   skip_dirs=[self.output_folder])
+        return {record.path: (record.size, record.mtime) for record in records}
+    
+    def wanted(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        output = os.path.abspath(self.output_folder)
+        if directory == output or directory.startswith(output + os.sep):
+            return False
+        relative = os.path.relpath(path, self.folder).replace(os.sep, "/")
+        if not self.recursive and "/" in relative:
+            return False
+        name = os.path.basename(path)
+        if not (matches_any(relative, self.include) or matches_any(name, self.include)):
+            return False
+        return not (self.exclude and (matches_any(relative, self.exclude) or matches_any(name, self.exclude)))
+    
+    def notice(self, path, now):
+        """(Re)start the settle timer for ``path``."""
+        if path not in self.in_flight and self.wanted(path):
+            self.pending[path] = (None, now)
+    
+    def settled_paths(self, now):
+        ready = []
+        for path, (seen, since) in list(self.pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                del self.pending[path]
+                continue
+            current = (st.st_size, st.st_mtime_ns)
+            if current != seen:
+                self.pending[path] = (current, now)
+            elif now - since >= self.settle_seconds and st.st_size > 0:
+                del self.pending[path]
+                if self.processed.get(path) != current:
+                    self.processed[path] = current
+                    ready.append(path)
+        return ready
+    
+    def finish(self, path, result, settled_at):
+        name = result['name']
+        output = None
+        if result['error']:
+            self.log(f"{os.path.basename(path)}: error reading PDF: {result['error']}", "error")
+            status = "Error"
+        elif not name:
+            self.log(f"{os.path.basename(path)}: could not find consignee name", "warning")
+            status = "Failed"
+        else:
+            output = next_output_name(self.name_counts, name)
+            try:
+                shutil.copy2(path, os.path.join(self.output_folder, output))
+                self.log(f"{os.path.basename(path)} -> {output}", "success")
+                status = "Done"
+            except Exception as e:
+                self.log(f"{os.path.basename(path)}: {str(e)}", "error")
+                status = "Error"
+        
+        self.counts[status] += 1
+        if self.on_result:
+            self.on_result({'source': path, 'output': output, 'status': status,
+                            'error': result['error'], 'latency': time.monotonic() - settled_at})
+    
+    def start_pool(self):
+        preload_for_workers(pypdf, pdfplumber)
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_ignore_interrupts)
+    
+    def finish_in_flight(self):
+        """Wait for the files still being extracted; a failed pool counts as an error for each."""
+        for path, (future, settled_at) in self.in_flight.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                result = failed_extraction(f"worker process failed: {str(e) or type(e).__name__}")
+            self.finish(path, result, settled_at)
+        self.in_flight.clear()
+    
+    def run(self, stop_event):
+        """Watch until ``stop_event`` is set; returns a summary dict."""
+        started = time.perf_counter()
+        prepare_output_folder(self.output_folder, self.log)
+        self.name_counts = name_counts_from_folder(self.output_folder)
+        self.processed = self.snapshot()
+        
+        events = queue.Queue()
+        observer = None
+        if self.use_watchdog:
+            from watchdog.observers import Observer
+            observer = Observer()
+            observer.schedule(_WatchdogEvents(events), self.folder, recursive=self.recursive)
+            observer.start()
+            self.log(f"Watching {self.folder} for new PDFs (file system events)", "info")
+        else:
+            self.log(f"Watching {self.folder} for new PDFs (polling every {self.poll_interval:g}s)", "info")
+        
+        executor = self.start_pool() if self.workers > 1 else None
+        previous = dict(self.processed)
+        next_poll = time.monotonic() + self.poll_interval
+        tick = min(0.25, self.settle_seconds / 4 or 0.25, self.poll_interval)
+        try:
+            while not stop_event.is_set():
+                now = time.monotonic()
+                while True:
+                    try:
+                        self.notice(events.get_nowait(), now)
+                    except queue.Empty:
+                        break
+                
+                if observer is None and now >= next_poll:
+                    current = self.snapshot()
+                    for path, stat in current.items():
+                        if previous.get(path) != stat:
+                            self.notice(path, now)
+                    previous = current
+                    next_poll = now + self.poll_interval
+                
+                for path in self.settled_paths(now):
+                    if executor is None:
+                        self.finish(path, _extract_job(path, self.layouts), now)
+                    else:
+                        future = executor.submit(_extract_job, path, self.layouts)
+                        self.in_flight[path] = (future, now)
+                
+                broken = False
+                for path, (future, settled_at) in list(self.in_flight.items()):
+                    if future.done():
+                        del self.in_flight[path]
+                        try:
+                            result = future.result()
+                        except BrokenProcessPool:
+                            broken = True
+                            result = failed_extraction("worker process died while reading this file")
+                        self.finish(path, result, settled_at)
+                
+                if broken:
+                    # Every file still queued on the dead pool fails with it;
+                    # which one killed the worker cannot be told apart.
+                    self.log("A worker process died; starting a new pool", "warning")
+                    self.finish_in_flight()
+                    executor.shutdown(wait=False)
+                    executor = self.start_pool()
+                
+                stop_event.wait(tick)
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            if executor is not None:
+                self.finish_in_flight()
+                executor.shutdown()
+        
+        succeeded = self.counts['Done']
+        total = sum(self.counts.values())
+        self.log(f"Stopped watching: renamed {succeeded} of {total} file(s)", "success")
+        return {
+            'workflow': 'watch',
+            'source': self.folder,
+            'output': self.output_folder,
+            'total': total,
+            'succeeded': succeeded,
+            'failed': total - succeeded,
+            'seconds': round(time.perf_counter() - started, 3),
+        }
@@ -0,0 +1,100 @@
+"""Name normalization shared by the PDF and Excel workflows.
+
+All patterns are compiled once at import. ``clean_consignee_name`` truncates
+a candidate line at the first stop word with a single alternation instead of
+one ``re.split`` per stop word, and both functions strip disallowed
+characters with one ``str.translate`` pass.
+"""
+import re
+
+STOP_WORD_PATTERNS = [
+    r"Buyer'?s?\s*Order\s*No\.?",
+    r"Dated",
+    r"GSTIN",
+    r"State\s*Name",
+    r"Invoice\s*No\.?",
+    r"Address",
+    r"Buyer",
+]
+
+_STOP_WORDS = [re.compile(pattern, re.IGNORECASE) for pattern in STOP_WORD_PATTERNS]
+
+# Zero-width lookahead so finditer reports every position where any stop
+# word starts, including overlapping ones; group 1 spans the stop word.
+_STOP_WORD_STARTS = re.compile(
+    "(?=(" + "|".join(f"(?:{pattern})" for pattern in STOP_WORD_PATTERNS) + "))",
+    re.IGNORECASE
+)
+
+_DISALLOWED_CHARACTERS = re.compile(r'[^a-zA-Z0-9\s]')
+_WHITESPACE_RUNS = re.compile(r'\s+')
+
+
+class _NameCharacters(dict):
+    """``str.translate`` table keeping ASCII letters, digits and whitespace.
+
+    Equivalent to ``re.sub(r'[^a-zA-Z0-9\\s]', '', text)``; entries are filled
+    in lazily the first time a code point is seen.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        keep = (char.isascii() and char.isalnum()) or char.isspace()
+        value = codepoint if keep else None
+        self[codepoint] = value
+        return value
+
+
+_NAME_CHARACTERS = _NameCharacters()
+
+
+def _truncate_sequentially(text):
+    for pattern in _STOP_WORDS:
+        text = pattern.split(text, 1)[0].strip()
+    return text
+
+
+def truncate_at_stop_words(text):
+    """Cut ``text`` at the first invoice label (``Dated``, ``GSTIN``, ...) it contains.
+
+    Matches the original behaviour of splitting on each stop word in turn.
+    The only case where that differs from cutting at the earliest match is
+    when two stop words overlap, which falls back to the sequential splits.
+    """
+    starts = _STOP_WORD_STARTS.finditer(text)
+    first = next(starts, None)
+    if first is None:
+        return text
+    following = next(starts, None)
+    if following is not None and following.start() < first.end(1):
+        return _truncate_sequentially(text)
+    return text[:first.start()]
+
+
+def sanitize_name(value):
+    """Drop everything but ASCII letters, digits and spaces; collapse whitespace."""
+    return ' '.join(str(value).translate(_NAME_CHARACTERS).split())
+
+
+def clean_consignee_name(text):
+    """Turn a line printed under ``Consignee (Ship to)`` into a file-name-safe name."""
+    return sanitize_name(truncate_at_stop_words(text)) or None
+
+
+def sanitize_lookup(values):
+    """Map each distinct value of the pandas Series ``values`` to ``sanitize_name(value)``.
+
+    The cleanup runs once per distinct value as vectorized ``.str``
+    operations. Values are converted with ``str()`` and kept as Python
+    objects, so the results match :func:`sanitize_name` exactly, including
+    for non-ASCII whitespace. Missing values are skipped, as ``groupby``
+    skips them.
+    """
+    distinct = values.dropna().drop_duplicates()
+    cleaned = (
+        distinct.map(str).astype(object)
+        .str.replace(_DISALLOWED_CHARACTERS, '', regex=True)
+        .str.replace(_WHITESPACE_RUNS, ' ', regex=True)
+        .str.strip()
+    )
+    return dict(zip(distinct, cleaned))
@@ -0,0 +1,37 @@
+import csv
+
+import openpyxl
+import pytest
+
+from engine import split_excel
+
+HEADER = ["Voucher No", "Party Name", "Comm Grouping", "Amount"]
+# "A&B" and "AB" both sanitize to "AB", so both groups want AB_Yarn.xlsx.
+ROWS = [
+    ["V1", "A&B", "Yarn", 100],
+    ["V2", "AB", "Yarn", 200],
+    ["V3", "A&B", "Yarn", 300],
+    ["V4", "ab", "Yarn", 400],
+]
+
+
+@pytest.mark.parametrize("engine", ["openpyxl", "xlsxwriter", "pandas"])
+@pytest.mark.parametrize("streaming", [False, True])
+def test_groups_with_the_same_file_name_get_their_own_files(tmp_path, engine, streaming):
+    if engine == "xlsxwriter":
+        pytest.importorskip("xlsxwriter")
+    source = tmp_path / "ledger.csv"
+    with open(source, "w", newline="") as f:
+        csv.writer(f).writerows([HEADER, *ROWS])
+    output = tmp_path / "output"
+
+    summary = split_excel(str(source), str(output), streaming=streaming, excel_engine=engine, workers=2)
+
+    assert summary['succeeded'] == 3
+    outputs = sorted(entry['output'] for entry in summary['files'])
+    assert outputs == ["AB_Yarn.xlsx", "AB_Yarn_2.xlsx", "ab_Yarn_3.xlsx"]
+    vouchers = []
+    for name in outputs:
+        sheet = openpyxl.load_workbook(output / name, read_only=True).active
+        vouchers.append(sorted(row[0] for row in sheet.iter_rows(min_row=2, values_only=True)))
+    assert sorted(vouchers) == [["V1", "V3"], ["V2"], ["V4"]]
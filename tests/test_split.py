@@ -0,0 +1,17 @@
+import os
+
+from corpus import generate_multi_page_pdf
+from engine import split_pdf
+
+PAGE_COUNT = 20
+
+
+def test_sharded_split_matches_serial(tmp_path):
+    pdf_path = generate_multi_page_pdf(str(tmp_path / "consolidated.pdf"), PAGE_COUNT)
+
+    serial = split_pdf(pdf_path, str(tmp_path / "serial"), workers=1)
+    sharded = split_pdf(pdf_path, str(tmp_path / "sharded"), workers=2, sharded=True)
+
+    assert serial['succeeded'] == sharded['succeeded'] == PAGE_COUNT
+    assert [page['output'] for page in sharded['pages']] == [page['output'] for page in serial['pages']]
+    assert sorted(os.listdir(tmp_path / "sharded")) == sorted(os.listdir(tmp_path / "serial"))
@@ -0,0 +1,7 @@
+from bench_startup import LOADED_CHECK, run_python
+
+
+def test_app_import_loads_no_heavy_libraries():
+    result = run_python(["-c", LOADED_CHECK])
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
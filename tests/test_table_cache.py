@@ -0,0 +1,44 @@
+import os
+import time
+
+import pandas as pd
+
+import engine
+from engine import clear_table_cache, evict_table_cache, load_table_cached
+
+
+def write_ledger(path):
+    pd.DataFrame({"Party Name": ["A", "B"], "Comm Grouping": ["Yarn", "Yarn"]}).to_csv(path, index=False)
+
+
+def test_failed_cache_write_returns_the_table_read_once(tmp_path, monkeypatch):
+    source = tmp_path / "ledger.csv"
+    write_ledger(source)
+    reads = []
+    read_table = engine.read_table
+    monkeypatch.setattr(engine, "read_table", lambda path: reads.append(path) or read_table(path))
+
+    def disk_full(*args, **kwargs):
+        raise OSError(28, "No space left on device")
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", disk_full)
+    monkeypatch.setattr(pd.DataFrame, "to_pickle", disk_full)
+
+    df, from_cache = load_table_cached(str(source), str(tmp_path / "cache"))
+
+    assert not from_cache
+    assert len(df) == 2
+    assert len(reads) == 1
+    assert os.listdir(tmp_path / "cache") == []
+
+
+def test_eviction_drops_old_and_least_recently_used_copies(tmp_path):
+    now = time.time()
+    for name, size, age_days in (("old", 10, 40), ("lru", 10, 2), ("recent", 10, 1)):
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        os.utime(path, (now - age_days * 86400,) * 2)
+
+    assert evict_table_cache(str(tmp_path), max_bytes=15) == 2
+    assert os.listdir(tmp_path) == ["recent"]
+    assert clear_table_cache(str(tmp_path)) == 1
+    assert os.listdir(tmp_path) == []